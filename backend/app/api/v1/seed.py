@@ -4,9 +4,11 @@ Run this from the deployed backend on Render
 """
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from datetime import date, datetime, timedelta, time
+from sqlalchemy import select, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import date, datetime, timedelta
 from typing import Dict
+import asyncio
 import random
 
 from app.core.database import get_db
@@ -31,82 +33,110 @@ router = APIRouter(prefix="/api/v1/seed", tags=["seed"])
 
 
 # -------------------------
-# Helper - safe add
+# Helpers - existence check / bulk insert
 # -------------------------
-async def _safe_add(db: AsyncSession, model, unique_filters: Dict = None, data: Dict = None):
-    if unique_filters:
-        q = select(model)
-        for k, v in unique_filters.items():
-            q = q.where(getattr(model, k) == v)
-        res = await db.execute(q)
-        if res.scalar_one_or_none():
-            return False
-    db.add(model(**data))
-    return True
+async def _exists(db: AsyncSession, *criteria) -> bool:
+    # SELECT 1 ... LIMIT 1: no full-row fetch or ORM hydration just to test existence
+    res = await db.execute(select(literal(1)).where(*criteria).limit(1))
+    return res.scalar() is not None
+
+
+async def _existing_keys(db: AsyncSession, column, keys) -> set:
+    # One IN query for the whole batch instead of one round-trip per row
+    res = await db.execute(select(column).where(column.in_(keys)))
+    return set(res.scalars().all())
+
+
+async def _insert_ignore(db: AsyncSession, model, rows: list, key: str) -> int:
+    # INSERT ... ON CONFLICT DO NOTHING: one atomic round-trip, no SELECT-then-INSERT race;
+    # RETURNING yields only the rows actually inserted. Not COPY: it has no ON CONFLICT
+    # (a re-run would fail on existing keys) and skips Python-side column defaults
+    if not rows:
+        return 0
+    # An executemany INSERT compiles its column list from the first row only, so give
+    # every row the union of all keys: absent columns become NULL instead of being dropped
+    # (or failing with a missing bind parameter)
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    rows = [{k: row.get(k) for k in columns} for row in rows]
+    column = getattr(model, key)
+    stmt = pg_insert(model).on_conflict_do_nothing(index_elements=[key]).returning(column)
+    res = await db.execute(stmt, rows)
+    return len(res.scalars().all())
+
+
+# Demo accounts only: bcrypt cost 4 instead of the default 12 (256x cheaper per hash)
+SEED_BCRYPT_ROUNDS = 4
+
+# Static seed rows, built once at import rather than on every call
+CAMPUSES_DATA = (
+    {"code": "H", "name": "Hanoi Campus", "address": "FPT Tower, 10 Pham Van Bach", "city": "Hanoi", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 24 7300 5588", "email": "hanoi@greenwich.edu.vn", "is_active": True},
+    {"code": "D", "name": "Da Nang Campus", "address": "Lot 30 Quang Trung Software City", "city": "Da Nang", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 236 3525 688", "email": "danang@greenwich.edu.vn", "is_active": True},
+    {"code": "C", "name": "Can Tho Campus", "address": "600A Nguyen Van Cu Noi Dai", "city": "Can Tho", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 292 3731 279", "email": "cantho@greenwich.edu.vn", "is_active": True},
+    {"code": "S", "name": "Ho Chi Minh Campus", "address": "778/B1 Nguyen Kiem Street, Ward 4", "city": "Ho Chi Minh", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 28 7300 5588", "email": "hcm@greenwich.edu.vn", "is_active": True},
+)
+
+MAJORS_DATA = (
+    {"code": "C", "name": "Computer Science", "description": "Software development, algorithms, and computing systems", "is_active": True},
+    {"code": "B", "name": "Business Administration", "description": "Management, finance, and business operations", "is_active": True},
+    {"code": "D", "name": "Graphic Design", "description": "Visual communication and digital media", "is_active": True},
+    {"code": "IT", "name": "Information Technology", "description": "IT infrastructure, networks, and systems administration", "is_active": True},
+    {"code": "MK", "name": "Marketing", "description": "Digital marketing, branding, and consumer behavior", "is_active": True},
+)
+
+SEMESTERS_DATA = (
+    {"code": "FALL2024", "name": "Fall 2024", "type": SemesterType.FALL, "academic_year": 2024, "start_date": date(2024,9,1), "end_date": date(2024,12,20), "is_current": True},
+    {"code": "SPRING2025", "name": "Spring 2025", "type": SemesterType.SPRING, "academic_year": 2025, "start_date": date(2025,1,6), "end_date": date(2025,5,15), "is_current": False},
+)
 
 
 # ============================================
 # USER MANAGEMENT TABLES (6 tables)
 # ============================================
 async def seed_campuses(db: AsyncSession) -> Dict:
-    campuses_data = [
-        {"code": "H", "name": "Hanoi Campus", "address": "FPT Tower, 10 Pham Van Bach", "city": "Hanoi", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 24 7300 5588", "email": "hanoi@greenwich.edu.vn", "is_active": True},
-        {"code": "D", "name": "Da Nang Campus", "address": "Lot 30 Quang Trung Software City", "city": "Da Nang", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 236 3525 688", "email": "danang@greenwich.edu.vn", "is_active": True},
-        {"code": "C", "name": "Can Tho Campus", "address": "600A Nguyen Van Cu Noi Dai", "city": "Can Tho", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 292 3731 279", "email": "cantho@greenwich.edu.vn", "is_active": True},
-        {"code": "S", "name": "Ho Chi Minh Campus", "address": "778/B1 Nguyen Kiem Street, Ward 4", "city": "Ho Chi Minh", "timezone": "Asia/Ho_Chi_Minh", "phone": "+84 28 7300 5588", "email": "hcm@greenwich.edu.vn", "is_active": True},
-    ]
-    created = 0
-    for c in campuses_data:
-        q = await db.execute(select(Campus).where(Campus.code == c["code"]))
-        if not q.scalar_one_or_none():
-            db.add(Campus(**c))
-            created += 1
-    await db.commit()
-    return {"entity": "campuses", "created": created, "total": len(campuses_data)}
+    created = await _insert_ignore(db, Campus, list(CAMPUSES_DATA), "code")
+    await db.flush()
+    return {"entity": "campuses", "created": created, "total": len(CAMPUSES_DATA)}
 
 
 async def seed_majors(db: AsyncSession) -> Dict:
-    majors_data = [
-        {"code": "C", "name": "Computer Science", "description": "Software development, algorithms, and computing systems", "is_active": True},
-        {"code": "B", "name": "Business Administration", "description": "Management, finance, and business operations", "is_active": True},
-        {"code": "D", "name": "Graphic Design", "description": "Visual communication and digital media", "is_active": True},
-        {"code": "IT", "name": "Information Technology", "description": "IT infrastructure, networks, and systems administration", "is_active": True},
-        {"code": "MK", "name": "Marketing", "description": "Digital marketing, branding, and consumer behavior", "is_active": True},
-    ]
-    created = 0
-    for m in majors_data:
-        q = await db.execute(select(Major).where(Major.code == m["code"]))
-        if not q.scalar_one_or_none():
-            db.add(Major(**m))
-            created += 1
-    await db.commit()
-    return {"entity": "majors", "created": created, "total": len(majors_data)}
+    created = await _insert_ignore(db, Major, list(MAJORS_DATA), "code")
+    await db.flush()
+    return {"entity": "majors", "created": created, "total": len(MAJORS_DATA)}
 
 
-async def seed_users(db: AsyncSession) -> Dict:
-    campuses = (await db.execute(select(Campus))).scalars().all()
-    majors = (await db.execute(select(Major))).scalars().all()
-    campus_map = {c.code: c.id for c in campuses}
-    major_map = {m.code: m.id for m in majors}
+async def _code_map(db: AsyncSession, model) -> Dict:
+    # Only (code, id) pairs are needed, so skip full ORM row hydration
+    res = await db.execute(select(model.code, model.id))
+    return dict(res.all())
+
+
+async def seed_users(db: AsyncSession, campus_map: Dict, major_map: Dict) -> Dict:
+    usernames = [
+        "admin", "nguyen.van.a", "tran.thi.b", "pham.van.c",
+        "gch210001", "gcd220002", "gcb230003", "gch230004", "gcit240005",
+    ]
+    passwords = ("admin123", "teacher123", "student123")
+    existing = await _existing_keys(db, User.username, usernames)
+    # bcrypt is CPU-bound: hash each distinct password once, in worker threads.
+    # Started only after the lookup, so a failed lookup can't leave hashing futures unawaited
+    pw = dict(zip(passwords, await asyncio.gather(
+        *(asyncio.to_thread(SecurityUtils.hash_password, p, rounds=SEED_BCRYPT_ROUNDS) for p in passwords)
+    )))
 
     users_data = [
-        {"firebase_uid": "admin-seed-uid", "username": "admin", "email": "admin@greenwich.edu.vn", "full_name": "System Administrator", "password_hash": SecurityUtils.hash_password("admin123"), "role": "admin", "status": "active", "campus_id": campus_map.get("H"), "phone_number": "+84 24 7300 5588"},
-        {"firebase_uid": "teacher1-seed-uid", "username": "nguyen.van.a", "email": "nguyen.van.a@greenwich.edu.vn", "full_name": "Nguyen Van A", "password_hash": SecurityUtils.hash_password("teacher123"), "role": "teacher", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("C"), "phone_number": "+84 98 765 4321", "date_of_birth": date(1985, 5, 15)},
-        {"firebase_uid": "teacher2-seed-uid", "username": "tran.thi.b", "email": "tran.thi.b@greenwich.edu.vn", "full_name": "Tran Thi B", "password_hash": SecurityUtils.hash_password("teacher123"), "role": "teacher", "status": "active", "campus_id": campus_map.get("D"), "major_id": major_map.get("B"), "phone_number": "+84 97 654 3210", "date_of_birth": date(1987, 8, 20)},
-        {"firebase_uid": "teacher3-seed-uid", "username": "pham.van.c", "email": "pham.van.c@greenwich.edu.vn", "full_name": "Pham Van C", "password_hash": SecurityUtils.hash_password("teacher123"), "role": "teacher", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("IT"), "phone_number": "+84 96 543 2109", "date_of_birth": date(1988, 3, 10)},
-        {"firebase_uid": "student1-seed-uid", "username": "gch210001", "email": "gch210001@greenwich.edu.vn", "full_name": "Le Van D", "password_hash": SecurityUtils.hash_password("student123"), "role": "student", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("C"), "phone_number": "+84 95 432 1098", "date_of_birth": date(2003, 3, 10), "year_entered": 2021},
-        {"firebase_uid": "student2-seed-uid", "username": "gcd220002", "email": "gcd220002@greenwich.edu.vn", "full_name": "Pham Thi E", "password_hash": SecurityUtils.hash_password("student123"), "role": "student", "status": "active", "campus_id": campus_map.get("D"), "major_id": major_map.get("D"), "phone_number": "+84 94 321 0987", "date_of_birth": date(2004, 7, 25), "year_entered": 2022},
-        {"firebase_uid": "student3-seed-uid", "username": "gcb230003", "email": "gcb230003@greenwich.edu.vn", "full_name": "Hoang Van F", "password_hash": SecurityUtils.hash_password("student123"), "role": "student", "status": "active", "campus_id": campus_map.get("C"), "major_id": major_map.get("B"), "phone_number": "+84 93 210 9876", "date_of_birth": date(2005, 11, 5), "year_entered": 2023},
-        {"firebase_uid": "student4-seed-uid", "username": "gch230004", "email": "gch230004@greenwich.edu.vn", "full_name": "Nguyen Thi G", "password_hash": SecurityUtils.hash_password("student123"), "role": "student", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("C"), "phone_number": "+84 92 109 8765", "date_of_birth": date(2005, 2, 14), "year_entered": 2023},
-        {"firebase_uid": "student5-seed-uid", "username": "gcit240005", "email": "gcit240005@greenwich.edu.vn", "full_name": "Tran Van H", "password_hash": SecurityUtils.hash_password("student123"), "role": "student", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("IT"), "phone_number": "+84 91 098 7654", "date_of_birth": date(2006, 6, 20), "year_entered": 2024},
+        {"firebase_uid": "admin-seed-uid", "username": "admin", "email": "admin@greenwich.edu.vn", "full_name": "System Administrator", "password_hash": pw["admin123"], "role": "admin", "status": "active", "campus_id": campus_map.get("H"), "phone_number": "+84 24 7300 5588"},
+        {"firebase_uid": "teacher1-seed-uid", "username": "nguyen.van.a", "email": "nguyen.van.a@greenwich.edu.vn", "full_name": "Nguyen Van A", "password_hash": pw["teacher123"], "role": "teacher", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("C"), "phone_number": "+84 98 765 4321", "date_of_birth": date(1985, 5, 15)},
+        {"firebase_uid": "teacher2-seed-uid", "username": "tran.thi.b", "email": "tran.thi.b@greenwich.edu.vn", "full_name": "Tran Thi B", "password_hash": pw["teacher123"], "role": "teacher", "status": "active", "campus_id": campus_map.get("D"), "major_id": major_map.get("B"), "phone_number": "+84 97 654 3210", "date_of_birth": date(1987, 8, 20)},
+        {"firebase_uid": "teacher3-seed-uid", "username": "pham.van.c", "email": "pham.van.c@greenwich.edu.vn", "full_name": "Pham Van C", "password_hash": pw["teacher123"], "role": "teacher", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("IT"), "phone_number": "+84 96 543 2109", "date_of_birth": date(1988, 3, 10)},
+        {"firebase_uid": "student1-seed-uid", "username": "gch210001", "email": "gch210001@greenwich.edu.vn", "full_name": "Le Van D", "password_hash": pw["student123"], "role": "student", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("C"), "phone_number": "+84 95 432 1098", "date_of_birth": date(2003, 3, 10), "year_entered": 2021},
+        {"firebase_uid": "student2-seed-uid", "username": "gcd220002", "email": "gcd220002@greenwich.edu.vn", "full_name": "Pham Thi E", "password_hash": pw["student123"], "role": "student", "status": "active", "campus_id": campus_map.get("D"), "major_id": major_map.get("D"), "phone_number": "+84 94 321 0987", "date_of_birth": date(2004, 7, 25), "year_entered": 2022},
+        {"firebase_uid": "student3-seed-uid", "username": "gcb230003", "email": "gcb230003@greenwich.edu.vn", "full_name": "Hoang Van F", "password_hash": pw["student123"], "role": "student", "status": "active", "campus_id": campus_map.get("C"), "major_id": major_map.get("B"), "phone_number": "+84 93 210 9876", "date_of_birth": date(2005, 11, 5), "year_entered": 2023},
+        {"firebase_uid": "student4-seed-uid", "username": "gch230004", "email": "gch230004@greenwich.edu.vn", "full_name": "Nguyen Thi G", "password_hash": pw["student123"], "role": "student", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("C"), "phone_number": "+84 92 109 8765", "date_of_birth": date(2005, 2, 14), "year_entered": 2023},
+        {"firebase_uid": "student5-seed-uid", "username": "gcit240005", "email": "gcit240005@greenwich.edu.vn", "full_name": "Tran Van H", "password_hash": pw["student123"], "role": "student", "status": "active", "campus_id": campus_map.get("H"), "major_id": major_map.get("IT"), "phone_number": "+84 91 098 7654", "date_of_birth": date(2006, 6, 20), "year_entered": 2024},
     ]
-    created = 0
-    for u in users_data:
-        q = await db.execute(select(User).where(User.username == u["username"]))
-        if not q.scalar_one_or_none():
-            db.add(User(**u))
-            created += 1
-    await db.commit()
+    new_rows = [u for u in users_data if u["username"] not in existing]
+    created = await _insert_ignore(db, User, new_rows, "username")
+    await db.flush()
     return {"entity": "users", "created": created, "total": len(users_data)}
 
 
@@ -118,11 +148,10 @@ async def seed_username_sequences(db: AsyncSession) -> Dict:
     ]
     created = 0
     for s in seqs:
-        q = await db.execute(select(UsernameSequence).where(UsernameSequence.base_username == s["base_username"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, UsernameSequence.base_username == s["base_username"]):
             db.add(UsernameSequence(**s))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "username_sequences", "created": created, "total": len(seqs)}
 
 
@@ -134,11 +163,10 @@ async def seed_student_sequences(db: AsyncSession) -> Dict:
     ]
     created = 0
     for s in seqs:
-        q = await db.execute(select(StudentSequence).where(StudentSequence.major_code == s["major_code"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, StudentSequence.major_code == s["major_code"]):
             db.add(StudentSequence(**s))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "student_sequences", "created": created, "total": len(seqs)}
 
 
@@ -149,11 +177,10 @@ async def seed_device_tokens(db: AsyncSession) -> Dict:
         tokens.append({"user_id": u.id, "token": f"fcm_{u.username}", "platform": "android", "is_active": True})
     created = 0
     for t in tokens:
-        q = await db.execute(select(DeviceToken).where(DeviceToken.token == t["token"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, DeviceToken.token == t["token"]):
             db.add(DeviceToken(**t))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "device_tokens", "created": created, "total": len(tokens)}
 
 
@@ -161,55 +188,38 @@ async def seed_device_tokens(db: AsyncSession) -> Dict:
 # ACADEMIC (8)
 # ============================================
 async def seed_semesters(db: AsyncSession) -> Dict:
-    data = [
-        {"code": "FALL2024", "name": "Fall 2024", "type": SemesterType.FALL, "academic_year": 2024, "start_date": date(2024,9,1), "end_date": date(2024,12,20), "is_current": True},
-        {"code": "SPRING2025", "name": "Spring 2025", "type": SemesterType.SPRING, "academic_year": 2025, "start_date": date(2025,1,6), "end_date": date(2025,5,15), "is_current": False},
-    ]
-    created = 0
-    for s in data:
-        q = await db.execute(select(Semester).where(Semester.code == s["code"]))
-        if not q.scalar_one_or_none():
-            db.add(Semester(**s))
-            created += 1
-    await db.commit()
-    return {"entity": "semesters", "created": created, "total": len(data)}
+    created = await _insert_ignore(db, Semester, list(SEMESTERS_DATA), "code")
+    await db.flush()
+    return {"entity": "semesters", "created": created, "total": len(SEMESTERS_DATA)}
 
 
-async def seed_courses(db: AsyncSession) -> Dict:
-    majors = (await db.execute(select(Major))).scalars().all()
-    mm = {m.code: m.id for m in majors}
+async def seed_courses(db: AsyncSession, major_map: Dict) -> Dict:
     data = [
-        {"course_code": "COMP1640", "name": "Enterprise Web Software Development", "credits": 15, "major_id": mm.get("C"), "level": 1},
-        {"course_code": "COMP1841", "name": "Database Development and Design", "credits": 15, "major_id": mm.get("C"), "level": 1},
-        {"course_code": "BUS1101", "name": "Introduction to Business", "credits": 15, "major_id": mm.get("B"), "level": 1},
+        {"course_code": "COMP1640", "name": "Enterprise Web Software Development", "credits": 15, "major_id": major_map.get("C"), "level": 1},
+        {"course_code": "COMP1841", "name": "Database Development and Design", "credits": 15, "major_id": major_map.get("C"), "level": 1},
+        {"course_code": "BUS1101", "name": "Introduction to Business", "credits": 15, "major_id": major_map.get("B"), "level": 1},
     ]
-    created = 0
-    for c in data:
-        q = await db.execute(select(Course).where(Course.course_code == c["course_code"]))
-        if not q.scalar_one_or_none():
-            db.add(Course(**c))
-            created += 1
-    await db.commit()
+    created = await _insert_ignore(db, Course, data, "course_code")
+    await db.flush()
     return {"entity": "courses", "created": created, "total": len(data)}
 
 
 async def seed_course_sections(db: AsyncSession) -> Dict:
-    semester = (await db.execute(select(Semester).where(Semester.code=="FALL2024"))).scalar_one_or_none()
-    courses = (await db.execute(select(Course))).scalars().all()
-    teachers = (await db.execute(select(User).where(User.role=="teacher"))).scalars().all()
-    campuses = (await db.execute(select(Campus))).scalars().all()
-    if not semester or not courses:
+    semester_id = (await db.execute(select(Semester.id).where(Semester.code=="FALL2024"))).scalar_one_or_none()
+    course_ids = (await db.execute(select(Course.id))).scalars().all()
+    teacher_ids = (await db.execute(select(User.id).where(User.role=="teacher"))).scalars().all()
+    campus_ids = (await db.execute(select(Campus.id))).scalars().all()
+    if not semester_id or not course_ids:
         return {"entity": "course_sections", "created": 0, "total": 0, "error": "missing deps"}
     data = []
-    for i, course in enumerate(courses):
-        data.append({"course_id": course.id, "semester_id": semester.id, "section_number": "01", "instructor_id": teachers[i%len(teachers)].id if teachers else None, "campus_id": campuses[i%len(campuses)].id if campuses else None, "room": f"R{i+100}", "max_students": 30, "enrolled_count": 0, "status": "active"})
+    for i, course_id in enumerate(course_ids):
+        data.append({"course_id": course_id, "semester_id": semester_id, "section_number": "01", "instructor_id": teacher_ids[i%len(teacher_ids)] if teacher_ids else None, "campus_id": campus_ids[i%len(campus_ids)] if campus_ids else None, "room": f"R{i+100}", "max_students": 30, "enrolled_count": 0, "status": "active"})
     created = 0
     for d in data:
-        q = await db.execute(select(CourseSection).where(CourseSection.course_id==d["course_id"], CourseSection.semester_id==d["semester_id"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, CourseSection.course_id==d["course_id"], CourseSection.semester_id==d["semester_id"]):
             db.add(CourseSection(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "course_sections", "created": created, "total": len(data)}
 
 
@@ -242,7 +252,7 @@ async def seed_schedules(db: AsyncSession) -> Dict:
             }]
             updated += 1
     
-    await db.commit()
+    await db.flush()
     return {"entity": "schedules", "updated_sections": updated, "total_sections": len(sections)}
 
 
@@ -256,16 +266,15 @@ async def seed_enrollments(db: AsyncSession) -> Dict:
             data.append({"student_id": st.id, "section_id": sec.id, "status": EnrollmentStatus.ENROLLED, "enrolled_at": datetime.now() - timedelta(days=random.randint(10,50))})
     created = 0
     for d in data:
-        q = await db.execute(select(Enrollment).where(Enrollment.student_id==d["student_id"], Enrollment.section_id==d["section_id"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, Enrollment.student_id==d["student_id"], Enrollment.section_id==d["section_id"]):
             db.add(Enrollment(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     # update counts
     for s in sections:
         cnt = len((await db.execute(select(Enrollment).where(Enrollment.section_id==s.id))).scalars().all())
         s.enrolled_count = cnt
-    await db.commit()
+    await db.flush()
     return {"entity": "enrollments", "created": created, "total": len(data)}
 
 
@@ -280,7 +289,7 @@ async def seed_assignments(db: AsyncSession) -> Dict:
     for d in data:
         db.add(Assignment(**d))
         created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "assignments", "created": created, "total": len(data)}
 
 
@@ -295,11 +304,10 @@ async def seed_grades(db: AsyncSession) -> Dict:
             data.append({"assignment_id": a.id, "student_id": e.student_id, "points_earned": points, "max_points": a.max_points, "percentage": round((points / float(a.max_points)) * 100, 2), "submitted_at": datetime.now()-timedelta(days=random.randint(1,10)), "graded_at": datetime.now()-timedelta(days=random.randint(0,5)), "status": GradeStatus.GRADED})
     created = 0
     for d in data:
-        q = await db.execute(select(Grade).where(Grade.assignment_id==d["assignment_id"], Grade.student_id==d["student_id"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, Grade.assignment_id==d["assignment_id"], Grade.student_id==d["student_id"]):
             db.add(Grade(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "grades", "created": created, "total": len(data)}
 
 
@@ -313,11 +321,10 @@ async def seed_attendance(db: AsyncSession) -> Dict:
             data.append({"section_id": e.section_id, "student_id": e.student_id, "attendance_date": dt, "status": status_val, "notes": None})
     created = 0
     for d in data:
-        q = await db.execute(select(Attendance).where(Attendance.section_id==d["section_id"], Attendance.student_id==d["student_id"], Attendance.attendance_date==d["attendance_date"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, Attendance.section_id==d["section_id"], Attendance.student_id==d["student_id"], Attendance.attendance_date==d["attendance_date"]):
             db.add(Attendance(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "attendance", "created": created, "total": len(data)}
 
 
@@ -328,11 +335,10 @@ async def seed_fee_structures(db: AsyncSession) -> Dict:
     data = [{"code": "UG_FALL2024", "name": "Undergraduate Fall 2024", "tuition_amount": 5000.0, "lab_fee": 200.0, "library_fee": 100.0, "registration_fee": 0.0, "is_active": True}]
     created = 0
     for d in data:
-        q = await db.execute(select(FeeStructure).where(FeeStructure.code==d["code"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, FeeStructure.code==d["code"]):
             db.add(FeeStructure(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "fee_structures", "created": created, "total": len(data)}
 
 
@@ -351,11 +357,10 @@ async def seed_invoices(db: AsyncSession) -> Dict:
         data.append({"student_id": st.id, "semester_id": sem.id, "invoice_number": inv_num, "issue_date": date(2024,8,15), "due_date": date(2024,9,15), "total_amount": total, "paid_amount": round(paid,2), "status": status})
     created = 0
     for d in data:
-        q = await db.execute(select(Invoice).where(Invoice.invoice_number==d["invoice_number"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, Invoice.invoice_number==d["invoice_number"]):
             db.add(Invoice(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "invoices", "created": created, "total": len(data)}
 
 
@@ -372,7 +377,7 @@ async def seed_invoice_lines(db: AsyncSession) -> Dict:
     for d in data:
         db.add(InvoiceLine(**d))
         created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "invoice_lines", "created": created, "total": len(data)}
 
 
@@ -383,11 +388,10 @@ async def seed_payments(db: AsyncSession) -> Dict:
         data.append({"invoice_id": inv.id, "amount": inv.paid_amount, "payment_method": random.choice([PaymentMethod.BANK_TRANSFER, PaymentMethod.CREDIT_CARD]), "reference_number": f"PAY-{2000+i}", "paid_at": datetime.now()-timedelta(days=random.randint(1,30)), "status": PaymentStatus.COMPLETED})
     created = 0
     for d in data:
-        q = await db.execute(select(Payment).where(Payment.reference_number==d["reference_number"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, Payment.reference_number==d["reference_number"]):
             db.add(Payment(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "payments", "created": created, "total": len(data)}
 
 
@@ -404,28 +408,26 @@ async def seed_chat_rooms(db: AsyncSession) -> Dict:
         data.append({"firebase_room_id": f"campus_{c.id}", "name": f"{c.name} - General", "type": RoomType.GROUP, "campus_id": c.id, "is_active": True})
     created = 0
     for d in data:
-        q = await db.execute(select(ChatRoom).where(ChatRoom.firebase_room_id==d["firebase_room_id"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, ChatRoom.firebase_room_id==d["firebase_room_id"]):
             db.add(ChatRoom(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "chat_rooms", "created": created, "total": len(data)}
 
 
 async def seed_chat_participants(db: AsyncSession) -> Dict:
-    rooms = (await db.execute(select(ChatRoom))).scalars().all()
-    users = (await db.execute(select(User))).scalars().all()
+    room_ids = (await db.execute(select(ChatRoom.id))).scalars().all()
+    user_ids = (await db.execute(select(User.id).limit(5))).scalars().all()
     data = []
-    for r in rooms:
-        for u in users[:5]:
-            data.append({"room_id": r.id, "user_id": u.id, "role": ParticipantRole.MEMBER, "joined_at": datetime.now()-timedelta(days=random.randint(1,60))})
+    for room_id in room_ids:
+        for user_id in user_ids:
+            data.append({"room_id": room_id, "user_id": user_id, "role": ParticipantRole.MEMBER, "joined_at": datetime.now()-timedelta(days=random.randint(1,60))})
     created = 0
     for d in data:
-        q = await db.execute(select(ChatParticipant).where(ChatParticipant.room_id==d["room_id"], ChatParticipant.user_id==d["user_id"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, ChatParticipant.room_id==d["room_id"], ChatParticipant.user_id==d["user_id"]):
             db.add(ChatParticipant(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "chat_participants", "created": created, "total": len(data)}
 
 
@@ -437,11 +439,10 @@ async def seed_support_tickets(db: AsyncSession) -> Dict:
         data.append({"ticket_number": f"TKT-{1000+i}", "requester_id": st.id, "assigned_to": admin.id if admin else None, "subject": "Help needed", "description": "Issue", "category": TicketCategory.OTHER, "priority": TicketPriority.NORMAL, "status": TicketStatus.OPEN})
     created = 0
     for d in data:
-        q = await db.execute(select(SupportTicket).where(SupportTicket.ticket_number==d["ticket_number"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, SupportTicket.ticket_number==d["ticket_number"]):
             db.add(SupportTicket(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "support_tickets", "created": created, "total": len(data)}
 
 
@@ -454,7 +455,7 @@ async def seed_ticket_events(db: AsyncSession) -> Dict:
     for d in data:
         db.add(TicketEvent(**d))
         created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "ticket_events", "created": created, "total": len(data)}
 
 
@@ -470,11 +471,10 @@ async def seed_documents(db: AsyncSession) -> Dict:
         data.append({"owner_id": teacher.id if teacher else None, "section_id": s.id, "title": "Syllabus", "file_path": f"/docs/syllabus_{s.id}.pdf", "mime_type": "application/pdf", "file_size": 102400, "category": DocumentCategory.SYLLABUS, "visibility": DocumentVisibility.RESTRICTED, "file_hash": f"h_{s.id}"})
     created = 0
     for d in data:
-        q = await db.execute(select(Document).where(Document.file_hash==d["file_hash"]))
-        if not q.scalar_one_or_none():
+        if not await _exists(db, Document.file_hash==d["file_hash"]):
             db.add(Document(**d))
             created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "documents", "created": created, "total": len(data)}
 
 
@@ -487,45 +487,51 @@ async def seed_document_requests(db: AsyncSession) -> Dict:
     for d in data:
         db.add(DocumentRequest(**d))
         created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "document_requests", "created": created, "total": len(data)}
 
 
 async def seed_announcements(db: AsyncSession) -> Dict:
-    campuses = (await db.execute(select(Campus))).scalars().all()
-    majors = (await db.execute(select(Major))).scalars().all()
+    campus_id = (await db.execute(select(Campus.id).limit(1))).scalar_one_or_none()
     # Get an admin or teacher user as author
-    users = (await db.execute(select(User).where(User.role.in_(["admin", "teacher"])))).scalars().all()
-    if not users:
+    author_id = (await db.execute(select(User.id).where(User.role.in_(["admin", "teacher"])).limit(1))).scalar_one_or_none()
+    if not author_id:
         return {"entity": "announcements", "created": 0, "total": 0, "message": "No admin/teacher users found"}
     
     data = [
-        {"title": "Welcome Fall Semester 2025", "body": "Welcome back to campus! We hope you had a great break. This semester brings exciting opportunities...", "campus_id": campuses[0].id if campuses else None, "author_id": users[0].id, "category": AnnouncementCategory.ACADEMIC, "priority": Priority.HIGH, "is_published": True, "publish_at": datetime.now()-timedelta(days=10)},
-        {"title": "Library Hours Update", "body": "Starting next week, the library will extend its hours until 10 PM on weekdays.", "campus_id": campuses[0].id if campuses else None, "author_id": users[0].id, "category": AnnouncementCategory.NEWS, "priority": Priority.NORMAL, "is_published": True, "publish_at": datetime.now()-timedelta(days=5)},
+        {"title": "Welcome Fall Semester 2025", "body": "Welcome back to campus! We hope you had a great break. This semester brings exciting opportunities...", "campus_id": campus_id, "author_id": author_id, "category": AnnouncementCategory.ACADEMIC, "priority": Priority.HIGH, "is_published": True, "publish_at": datetime.now()-timedelta(days=10)},
+        {"title": "Library Hours Update", "body": "Starting next week, the library will extend its hours until 10 PM on weekdays.", "campus_id": campus_id, "author_id": author_id, "category": AnnouncementCategory.NEWS, "priority": Priority.NORMAL, "is_published": True, "publish_at": datetime.now()-timedelta(days=5)},
     ]
     created = 0
     for d in data:
         db.add(Announcement(**d))
         created += 1
-    await db.commit()
+    await db.flush()
     return {"entity": "announcements", "created": created, "total": len(data)}
 
 
 # Main endpoint
 @router.post("/run")
 async def run_seed(db: AsyncSession = Depends(get_db)):
+    # Phases only flush; get_db commits once at the end (or rolls everything back).
+    # They run one after another on purpose: an AsyncSession can't run concurrent
+    # operations, and spreading phases over separately committing sessions would
+    # give up that all-or-nothing commit and the FK ordering between phases
     try:
         results = []
         # User mgmt
         results.append(await seed_campuses(db))
         results.append(await seed_majors(db))
-        results.append(await seed_users(db))
+        # Lookup maps shared by the phases that need them
+        campus_map = await _code_map(db, Campus)
+        major_map = await _code_map(db, Major)
+        results.append(await seed_users(db, campus_map, major_map))
         results.append(await seed_username_sequences(db))
         results.append(await seed_student_sequences(db))
         results.append(await seed_device_tokens(db))
         # Academic
         results.append(await seed_semesters(db))
-        results.append(await seed_courses(db))
+        results.append(await seed_courses(db, major_map))
         results.append(await seed_course_sections(db))
         results.append(await seed_schedules(db))
         results.append(await seed_enrollments(db))
@@ -3,6 +3,8 @@ Database connection and session management
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
+from functools import lru_cache
 from typing import AsyncGenerator
 from app.core.settings import settings
 
@@ -30,6 +32,41 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Session factory for one-shot CLI scripts (seeding, Firebase sync).
+# NullPool opens one connection per session and closes it on release:
+# no idle pool to maintain, no pre-ping per checkout, nothing to dispose at exit.
+# Built on first use, so API workers that never run a script don't create the engine.
+@lru_cache(maxsize=None)
+def _script_sessionmaker() -> async_sessionmaker:
+    script_engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DATABASE_ECHO,
+        poolclass=NullPool,
+        connect_args={
+            "server_settings": {
+                "application_name": "academic_portal_script",
+            }
+        }
+    )
+    return async_sessionmaker(
+        script_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+def script_session() -> AsyncSession:
+    """
+    New session for CLI scripts, on the lazily created NullPool script engine
+    
+    Usage:
+        async with script_session() as session:
+            ...
+    """
+    return _script_sessionmaker()()
+
 # Base class for models
 Base = declarative_base()
 
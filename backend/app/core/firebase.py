@@ -1,12 +1,13 @@
 """
 Firebase Admin SDK initialization and utilities
 """
+import asyncio
 import firebase_admin
 from firebase_admin import credentials, auth, firestore
 from app.core.settings import settings
 import json
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List
 
 
 def initialize_firebase():
@@ -70,6 +71,29 @@ def get_firestore_client():
     return firestore.client()
 
 
+# Firebase Admin calls are blocking HTTPS requests: keep this many in flight in worker threads
+FIREBASE_CONCURRENCY = 20
+
+
+async def run_concurrently(fn: Callable, items: list, limit: int = FIREBASE_CONCURRENCY) -> List:
+    """
+    Call a blocking Firebase function for each item in worker threads, `limit` in flight
+    
+    A semaphore rather than fixed batches: a slow request only holds its own slot
+    instead of stalling the rest of its batch.
+    
+    Returns:
+        One result per item, in order; exceptions are returned, not raised
+    """
+    sem = asyncio.Semaphore(limit)
+    
+    async def call(item):
+        async with sem:
+            return await asyncio.to_thread(fn, item)
+    
+    return await asyncio.gather(*(call(item) for item in items), return_exceptions=True)
+
+
 class FirebaseService:
     """Firebase service for authentication and user management"""
     
@@ -229,7 +253,24 @@ class FirebaseService:
             return auth.update_user(uid, **kwargs)
         except Exception as e:
             raise Exception(f"Failed to update user: {e}")
-    
+
+    @staticmethod
+    def import_users(users: list, hash_alg=None) -> auth.UserImportResult:
+        """
+        Bulk-create Firebase users in one request (max 1000 per call)
+
+        Args:
+            users: List of auth.ImportUserRecord
+            hash_alg: auth.UserImportHash matching the records' password_hash
+
+        Returns:
+            UserImportResult (per-record failures are in .errors)
+        """
+        try:
+            return auth.import_users(users, hash_alg=hash_alg)
+        except Exception as e:
+            raise Exception(f"Failed to import users: {e}")
+
     @staticmethod
     def delete_user(uid: str) -> None:
         """
@@ -22,14 +22,20 @@ class SecurityUtils:
     """Security utility functions"""
     
     @staticmethod
-    def hash_password(password: str) -> str:
+    def hash_password(password: str, rounds: Optional[int] = None) -> str:
         """
         Hash a password
         
+        Args:
+            password: Plain text password
+            rounds: Optional bcrypt work factor override (seed scripts only)
+        
         Note: Kept for backward compatibility during Firebase migration.
         New users should be created in Firebase, not with password hashes.
         """
-        return pwd_context.hash(password)
+        if rounds is None:
+            return pwd_context.hash(password)
+        return pwd_context.handler("bcrypt").using(rounds=rounds).hash(password)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
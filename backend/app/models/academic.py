@@ -1,7 +1,7 @@
 """
 Academic models - courses, enrollments, grades, attendance
 """
-from sqlalchemy import Column, Integer, String, Boolean, Date, Time, DateTime, ForeignKey, Numeric, Text, Enum as SQLEnum, CheckConstraint, UniqueConstraint, text
+from sqlalchemy import Column, Integer, String, Boolean, Date, Time, DateTime, ForeignKey, Numeric, Text, Enum as SQLEnum, CheckConstraint, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, validates
 from datetime import time as pytime
@@ -297,9 +297,13 @@ class Attendance(BaseModel):
     """Attendance model with compliance tracking"""
     
     __tablename__ = "attendance"
+    __table_args__ = (
+        # Append-only and physically ordered by date: BRIN instead of a B-tree
+        Index('brin_attendance_date', 'date', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
     
     enrollment_id = Column(Integer, ForeignKey("enrollments.id"), nullable=False, index=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     
     # Status
     status = Column(String(20), default="present", index=True)
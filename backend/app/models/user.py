@@ -1,7 +1,7 @@
 """
 User and authentication models
 """
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Enum as SQLEnum, Text, Index, text
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -113,6 +113,10 @@ class Major(BaseModel):
     """Major/Program model"""
     
     __tablename__ = "majors"
+    __table_args__ = (
+        # Partial: most majors have no coordinator
+        Index('ix_majors_coordinator_id', 'coordinator_id', postgresql_where=text('coordinator_id IS NOT NULL')),
+    )
     
     code = Column(String(3), unique=True, nullable=False)  # C, B, D
     name = Column(String(100), nullable=False)
@@ -8,52 +8,125 @@ This migration adds indexes to improve performance of:
 4. User role-based queries
 """
 import asyncio
+from typing import NamedTuple, Optional, Tuple
 from sqlalchemy import text
 from app.core.database import engine
 
 
+class Index(NamedTuple):
+    """A single index definition"""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+    using: Optional[str] = None
+    with_options: Optional[str] = None
+    where: Optional[str] = None
+
+
+# Performance indexes, grouped by table
+INDEXES = [
+    # Attendance table indexes
+    Index("idx_attendance_enrollment", "attendance", ("enrollment_id",)),
+    # Attendance is append-only and physically ordered by date, so a BRIN
+    # index serves date-range scans at a fraction of a B-tree's size
+    Index("brin_attendance_date", "attendance", ("date",), using="BRIN", with_options="pages_per_range = 32"),
+    Index("idx_attendance_status", "attendance", ("status",)),
+    Index("idx_attendance_enrollment_date", "attendance", ("enrollment_id", "date")),
+    
+    # Enrollment table indexes
+    Index("idx_enrollments_status", "enrollments", ("status",)),
+    Index("idx_enrollments_section_status", "enrollments", ("course_section_id", "status")),
+    
+    # Course sections indexes
+    Index("idx_course_sections_course", "course_sections", ("course_id",)),
+    Index("idx_course_sections_semester", "course_sections", ("semester_id",)),
+    Index("idx_course_sections_instructor", "course_sections", ("instructor_id",)),
+    Index("idx_course_sections_active", "course_sections", ("is_active",)),
+    
+    # Course indexes
+    Index("idx_courses_major", "courses", ("major_id",)),
+    Index("idx_courses_active", "courses", ("is_active",)),
+]
+
+# Indexes superseded by the ones above
+DROPPED_INDEXES = ["idx_attendance_date"]
+
+
+def build_sql(idx: Index) -> str:
+    """Build the CREATE INDEX statement for an index definition"""
+    sql = f"CREATE INDEX IF NOT EXISTS {idx.name} ON {idx.table}"
+    if idx.using:
+        sql += f" USING {idx.using}"
+    sql += f" ({', '.join(idx.columns)})"
+    if idx.with_options:
+        sql += f" WITH ({idx.with_options})"
+    if idx.where:
+        sql += f" WHERE {idx.where}"
+    return sql
+
+
 async def add_indexes():
     """Add performance indexes to the database"""
     
-    # List of CREATE INDEX statements
-    index_statements = [
-        # Attendance table indexes
-        "CREATE INDEX IF NOT EXISTS idx_attendance_enrollment ON attendance (enrollment_id)",
-        "CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance (date)",
-        "CREATE INDEX IF NOT EXISTS idx_attendance_status ON attendance (status)",
-        "CREATE INDEX IF NOT EXISTS idx_attendance_enrollment_date ON attendance (enrollment_id, date)",
-        
-        # Enrollment table indexes
-        "CREATE INDEX IF NOT EXISTS idx_enrollments_status ON enrollments (status)",
-        "CREATE INDEX IF NOT EXISTS idx_enrollments_section_status ON enrollments (course_section_id, status)",
-        
-        # Course sections indexes
-        "CREATE INDEX IF NOT EXISTS idx_course_sections_course ON course_sections (course_id)",
-        "CREATE INDEX IF NOT EXISTS idx_course_sections_semester ON course_sections (semester_id)",
-        "CREATE INDEX IF NOT EXISTS idx_course_sections_instructor ON course_sections (instructor_id)",
-        "CREATE INDEX IF NOT EXISTS idx_course_sections_active ON course_sections (is_active)",
-        
-        # Course indexes
-        "CREATE INDEX IF NOT EXISTS idx_courses_major ON courses (major_id)",
-        "CREATE INDEX IF NOT EXISTS idx_courses_active ON courses (is_active)",
-    ]
-    
     async with engine.begin() as conn:
         print("\n" + "="*80)
         print("ADDING PERFORMANCE INDEXES")
         print("="*80 + "\n")
         
-        for statement in index_statements:
-            try:
-                await conn.execute(text(statement))
-                # Extract index name for logging
-                index_name = statement.split("INDEX IF NOT EXISTS ")[1].split(" ON ")[0]
-                table_name = statement.split(" ON ")[1].split(" (")[0]
-                print(f"✓ Created/verified index {index_name} on {table_name}")
-                    
-            except Exception as e:
-                print(f"✗ Error creating index: {str(e)}")
-                print(f"   Statement: {statement}")
+        # Skip indexes whose table/columns don't exist instead of failing the whole batch
+        result = await conn.execute(
+            text("""
+                SELECT table_name, column_name
+                FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                AND table_name = ANY(:tables)
+            """),
+            {"tables": sorted({idx.table for idx in INDEXES})}
+        )
+        existing_columns = {(row[0], row[1]) for row in result}
+        
+        indexes = []
+        for idx in INDEXES:
+            missing = [col for col in idx.columns if (idx.table, col) not in existing_columns]
+            if missing:
+                print(f"✗ Skipping index {idx.name}: {idx.table} has no column(s) {', '.join(missing)}")
+            else:
+                indexes.append(idx)
+        
+        # Look up which indexes already exist, so the log can say exactly what the batch changed
+        result = await conn.execute(
+            text("""
+                SELECT indexname
+                FROM pg_indexes
+                WHERE schemaname = current_schema()
+                AND indexname = ANY(:names)
+            """),
+            {"names": DROPPED_INDEXES + [idx.name for idx in indexes]}
+        )
+        existing_indexes = {row[0] for row in result}
+        
+        # Run every statement server-side in a single DO block: one round-trip
+        # instead of one per index, and the whole batch succeeds or fails together.
+        statements = [f"DROP INDEX IF EXISTS {name}" for name in DROPPED_INDEXES]
+        statements += [build_sql(idx) for idx in indexes]
+        do_block = "DO $$ BEGIN\n" + "".join(f"    {statement};\n" for statement in statements) + "END $$"
+        
+        try:
+            await conn.execute(text(do_block))
+        except Exception as e:
+            print(f"✗ Error creating indexes: {str(e)}")
+            raise
+        
+        for name in DROPPED_INDEXES:
+            if name in existing_indexes:
+                print(f"✓ Dropped superseded index {name}")
+            else:
+                print(f"- Superseded index {name} not present, nothing to drop")
+        for idx in indexes:
+            if idx.name in existing_indexes:
+                print(f"- Index {idx.name} on {idx.table} already exists")
+            else:
+                print(f"✓ Created index {idx.name} on {idx.table}")
         
         print("\n" + "="*80)
         print("INDEX CREATION COMPLETE")
@@ -22,19 +22,26 @@ def upgrade() -> None:
     # Add code column to roles table
     op.add_column('roles', sa.Column('code', sa.String(length=20), nullable=True))
     
-    # Populate existing roles with codes
+    # Populate existing roles with codes: join against the known mapping so
+    # only matching rows are touched, then fall back for custom roles
     op.execute("""
-        UPDATE roles 
-        SET code = CASE 
-            WHEN name = 'student' THEN 'STU'
-            WHEN name = 'teacher' THEN 'TCH'
-            WHEN name = 'admin' THEN 'ADM'
-            WHEN name = 'super_admin' THEN 'SADM'
-            WHEN name = 'registrar' THEN 'REG'
-            WHEN name = 'academic_admin' THEN 'AADM'
-            WHEN name = 'finance_admin' THEN 'FADM'
-            ELSE UPPER(LEFT(name, 4))
-        END
+        UPDATE roles r
+        SET code = v.code
+        FROM (VALUES
+            ('student', 'STU'),
+            ('teacher', 'TCH'),
+            ('admin', 'ADM'),
+            ('super_admin', 'SADM'),
+            ('registrar', 'REG'),
+            ('academic_admin', 'AADM'),
+            ('finance_admin', 'FADM')
+        ) AS v(name, code)
+        WHERE r.name = v.name
+          AND r.code IS NULL
+    """)
+    op.execute("""
+        UPDATE roles
+        SET code = UPPER(LEFT(name, 4))
         WHERE code IS NULL
     """)
     
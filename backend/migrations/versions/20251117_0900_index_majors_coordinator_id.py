@@ -0,0 +1,36 @@
+"""index_majors_coordinator_id
+
+Revision ID: 3c8e5b1f2a94
+Revises: d7a16712a8be
+Create Date: 2025-11-17 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e5b1f2a94'
+down_revision: Union[str, Sequence[str], None] = 'd7a16712a8be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Index the FK for coordinator lookups and FK checks on user delete; most
+    # majors have no coordinator, so keep the index partial
+    op.create_index(
+        'ix_majors_coordinator_id',
+        'majors',
+        ['coordinator_id'],
+        unique=False,
+        postgresql_where=sa.text('coordinator_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_majors_coordinator_id', table_name='majors')
@@ -0,0 +1,39 @@
+"""replace_attendance_date_btree_with_brin
+
+Revision ID: 5e2d9a7c4b61
+Revises: 3c8e5b1f2a94
+Create Date: 2025-11-17 09:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2d9a7c4b61'
+down_revision: Union[str, Sequence[str], None] = '3c8e5b1f2a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Attendance is append-only and physically ordered by date, so a BRIN index
+    # serves date-range scans; the B-tree only duplicated it at many times the size
+    op.create_index(
+        'brin_attendance_date',
+        'attendance',
+        ['date'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+        if_not_exists=True,
+    )
+    op.drop_index(op.f('ix_attendance_date'), table_name='attendance')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('brin_attendance_date', table_name='attendance')
+    op.create_index(op.f('ix_attendance_date'), 'attendance', ['date'], unique=False)
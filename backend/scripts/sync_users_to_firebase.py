@@ -3,14 +3,87 @@ Sync PostgreSQL users to Firebase Authentication
 Creates Firebase users for all users in the database
 """
 import asyncio
+import base64
+import os
 import sys
 from pathlib import Path
 import asyncpg
+from firebase_admin import auth
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.core.firebase import FirebaseService, initialize_firebase
+from app.core.firebase import FirebaseService, initialize_firebase, run_concurrently
+from app.core.security import SecurityUtils
+from app.core.settings import settings
+
+
+# Firebase accepts at most this many records per import_users call
+FIREBASE_IMPORT_LIMIT = 1000
+
+# ...and at most this many identifiers per get_users call
+FIREBASE_LOOKUP_LIMIT = 100
+
+# Above this many firebase_uid write-backs, COPY into a temp table + one UPDATE ... FROM
+# beats executemany's per-row statement
+UID_COPY_THRESHOLD = 1000
+
+
+def build_claims(user) -> dict:
+    """Custom claims (roles as a list, campus, etc.) for one PostgreSQL user"""
+    claims = {
+        "roles": [user['role']],
+        "db_user_id": user['id'],
+        "username": user['username']
+    }
+    
+    if user['campus_id']:
+        claims["campus_id"] = user['campus_id']
+    if user['major_id']:
+        claims["major_id"] = user['major_id']
+    
+    return claims
+
+
+def new_firebase_uids(count: int) -> list:
+    """Random 28-char URL-safe UIDs (Firebase's own format), cut from a single urandom read"""
+    raw = os.urandom(21 * count)
+    return [base64.urlsafe_b64encode(raw[i:i + 21]).decode() for i in range(0, 21 * count, 21)]
+
+
+def lookup_firebase_users(emails: list) -> dict:
+    """Map lowercased email -> UserRecord for whichever of these emails exist in Firebase (one get_users request)
+    
+    Firebase stores emails lowercased, so callers must look results up with email.lower() too.
+    """
+    result = auth.get_users([auth.EmailIdentifier(email) for email in emails])
+    return {u.email.lower(): u for u in result.users}
+
+
+async def write_firebase_uids(conn: asyncpg.Connection, uid_updates: list) -> None:
+    """Store (firebase_uid, user_id) pairs in users.firebase_uid, skipping rows that already match"""
+    if len(uid_updates) <= UID_COPY_THRESHOLD:
+        await conn.executemany("""
+            UPDATE users 
+            SET firebase_uid = $1, updated_at = NOW()
+            WHERE id = $2 AND firebase_uid IS DISTINCT FROM $1
+        """, uid_updates)
+        return
+    
+    async with conn.transaction():
+        await conn.execute("""
+            CREATE TEMP TABLE users_uid_stage (firebase_uid varchar(128), id integer PRIMARY KEY)
+            ON COMMIT DROP
+        """)
+        await conn.copy_records_to_table(
+            'users_uid_stage', records=uid_updates, columns=['firebase_uid', 'id']
+        )
+        await conn.execute("""
+            UPDATE users 
+            SET firebase_uid = s.firebase_uid, updated_at = NOW()
+            FROM users_uid_stage s
+            WHERE users.id = s.id AND users.firebase_uid IS DISTINCT FROM s.firebase_uid
+        """)
 
 
 async def sync_users_to_firebase():
@@ -23,88 +96,149 @@ async def sync_users_to_firebase():
     
     print("🔄 Syncing users from PostgreSQL to Firebase...\n")
     
-    # Connect to local database
+    # Connect using the configured DATABASE_URL (asyncpg takes a plain postgresql:// DSN)
     conn = await asyncpg.connect(
-        host="localhost",
-        port=5432,
-        user="postgres",
-        password="postgres",
-        database="greenwich_local",
+        settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
     )
     
     try:
-        # Get all active users from PostgreSQL
-        users = await conn.fetch("""
-            SELECT id, username, email, full_name, role, campus_id, major_id, firebase_uid
-            FROM users 
-            WHERE status = 'active'
-            ORDER BY id
-        """)
-        
-        print(f"📊 Found {len(users)} active users in PostgreSQL\n")
-        
         success_count = 0
         skip_count = 0
         error_count = 0
+        total_count = 0
         
         # Default password for all users: Test123!@#
         default_password = "Test123!@#"
+        password_hash = None
         
-        for user in users:
-            try:
-                # Check if user already exists in Firebase
-                firebase_uid = None
+        uid_updates = []
+        
+        # Page through active users by id (keyset), one import-sized page at a time, so Firebase
+        # work on the first page starts before the rest of the table is read. Each page is its
+        # own autocommit query: no transaction or snapshot stays open during Firebase calls
+        last_id = 0
+        while True:
+            users = await conn.fetch("""
+                SELECT id, username, email, full_name, role, campus_id, major_id, firebase_uid
+                FROM users 
+                WHERE status = 'active' AND id > $1
+                ORDER BY id
+                LIMIT $2
+            """, last_id, FIREBASE_IMPORT_LIMIT)
+            if not users:
+                break
+            last_id = users[-1]['id']
+            total_count += len(users)
+            
+            # A malformed address would fail its whole get_users batch: reject it per user
+            valid_users = []
+            for user in users:
                 try:
-                    existing_user = FirebaseService.get_user_by_email(user['email'])
-                    print(f"⏭️  Skipped: {user['username']} ({user['email']}) - Already exists in Firebase")
-                    skip_count += 1
-                    firebase_uid = existing_user.uid
-                except Exception:
-                    # User doesn't exist, create it
-                    pass
-                
-                if not firebase_uid:
-                    # Create user in Firebase
-                    firebase_user = FirebaseService.create_user(
-                        email=user['email'],
-                        password=default_password,
-                        display_name=user['full_name']
-                    )
-                    firebase_uid = firebase_user.uid
-                    
-                    print(f"✅ Created: {user['username']} ({user['email']})")
-                    success_count += 1
-                
-                # Set custom claims (roles as a list, campus, etc.)
-                role_value = user['role']
-                claims = {
-                    "roles": [role_value],
-                    "db_user_id": user['id'],
-                    "username": user['username']
-                }
-                
-                if user['campus_id']:
-                    claims["campus_id"] = user['campus_id']
-                if user['major_id']:
-                    claims["major_id"] = user['major_id']
+                    auth.EmailIdentifier(user['email'])
+                except ValueError as e:
+                    print(f"❌ Error processing {user['username']}: {str(e)}")
+                    error_count += 1
+                    continue
+                valid_users.append(user)
+            
+            # Check which users already exist in Firebase: one get_users call per 100 emails,
+            # not a lookup per user
+            chunks = [
+                valid_users[start:start + FIREBASE_LOOKUP_LIMIT]
+                for start in range(0, len(valid_users), FIREBASE_LOOKUP_LIMIT)
+            ]
+            results = await run_concurrently(
+                lambda chunk: lookup_firebase_users([user['email'] for user in chunk]), chunks
+            )
+            records_by_email = {}
+            users = []
+            for chunk, found in zip(chunks, results):
+                if isinstance(found, Exception):
+                    print(f"❌ Error looking up {len(chunk)} users: {str(found)}")
+                    error_count += len(chunk)
+                    continue
+                records_by_email.update(found)
+                users += chunk
+            existing = [
+                (user, records_by_email[user['email'].lower()])
+                for user in users if user['email'].lower() in records_by_email
+            ]
+            new_users = [user for user in users if user['email'].lower() not in records_by_email]
+            
+            # Existing users: refresh custom claims (Firebase has no bulk variant for this),
+            # but only where they differ from what get_users already returned
+            stale = []
+            for user, record in existing:
+                claims = build_claims(user)
+                if (record.custom_claims or {}) != claims:
+                    stale.append((record.uid, claims))
+            results = await run_concurrently(
+                lambda pair: FirebaseService.set_custom_user_claims(*pair), stale
+            )
+            claim_errors = {
+                uid: result for (uid, _), result in zip(stale, results) if isinstance(result, Exception)
+            }
+            for user, record in existing:
+                firebase_uid = record.uid
+                if firebase_uid in claim_errors:
+                    print(f"❌ Error processing {user['username']}: {str(claim_errors[firebase_uid])}")
+                    error_count += 1
+                    continue
                 
-                FirebaseService.set_custom_user_claims(firebase_uid, claims)
+                print(f"⏭️  Skipped: {user['username']} ({user['email']}) - Already exists in Firebase")
+                skip_count += 1
                 
                 # Update firebase_uid in PostgreSQL if not set
                 if not user['firebase_uid']:
-                    await conn.execute("""
-                        UPDATE users 
-                        SET firebase_uid = $1, updated_at = NOW()
-                        WHERE id = $2
-                    """, firebase_uid, user['id'])
-                
+                    uid_updates.append((firebase_uid, user['id']))
+            
+            if not new_users:
+                continue
+            
+            # New users: one import_users call per page (pages are import-sized), claims included.
+            # Everyone shares the default password, so it is bcrypt-hashed once.
+            if password_hash is None:
+                password_hash = (await asyncio.to_thread(SecurityUtils.hash_password, default_password)).encode()
+            records = [
+                auth.ImportUserRecord(
+                    uid=uid,
+                    email=user['email'],
+                    display_name=user['full_name'],
+                    password_hash=password_hash,
+                    custom_claims=build_claims(user),
+                )
+                for user, uid in zip(new_users, new_firebase_uids(len(new_users)))
+            ]
+            
+            try:
+                result = await asyncio.to_thread(
+                    FirebaseService.import_users, records, auth.UserImportHash.bcrypt()
+                )
             except Exception as e:
-                print(f"❌ Error processing {user['username']}: {str(e)}")
-                error_count += 1
+                print(f"❌ Error importing {len(records)} users: {str(e)}")
+                error_count += len(records)
                 continue
+            
+            failed = {err.index: err.reason for err in result.errors}
+            for i, (user, record) in enumerate(zip(new_users, records)):
+                if i in failed:
+                    print(f"❌ Error processing {user['username']}: {failed[i]}")
+                    error_count += 1
+                    continue
+                
+                print(f"✅ Created: {user['username']} ({user['email']})")
+                success_count += 1
+                
+                # Update firebase_uid in PostgreSQL if not set
+                if not user['firebase_uid']:
+                    uid_updates.append((record.uid, user['id']))
+    
+        # One batched write instead of a round-trip per user
+        if uid_updates:
+            await write_firebase_uids(conn, uid_updates)
         
         print(f"\n{'='*60}")
-        print(f"📊 Summary:")
+        print(f"📊 Summary ({total_count} active users in PostgreSQL):")
         print(f"  ✅ Created: {success_count}")
         print(f"  ⏭️  Skipped: {skip_count}")
         print(f"  ❌ Errors:  {error_count}")
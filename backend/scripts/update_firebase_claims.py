@@ -6,71 +6,111 @@ Firebase custom claims include a 'roles' list consistent with DB.
 It requires Firebase credentials to be configured (same as sync script).
 """
 import asyncio
+import enum
 import sys
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.core.database import get_db
-from app.core.firebase import FirebaseService, initialize_firebase
+from app.core.database import script_session
+from app.core.firebase import FirebaseService, initialize_firebase, run_concurrently
+from firebase_admin import auth
 from app.models import User
 from sqlalchemy import select
 
 
+# Firebase accepts at most this many identifiers per get_users call
+FIREBASE_LOOKUP_LIMIT = 100
+
+# Legacy DB role names -> role names used in Firebase claims
+ROLE_MAP = {'admin': 'super_admin'}
+
+
+def build_claims(user) -> dict:
+    """Custom claims (roles as a list, campus, etc.) for one user row"""
+    raw_role = user.role.value if isinstance(user.role, enum.Enum) else user.role
+    return {
+        "roles": [ROLE_MAP.get(raw_role, raw_role)],
+        "db_user_id": user.id,
+        "username": user.username,
+        **({"campus_id": user.campus_id} if user.campus_id else {}),
+        **({"major_id": user.major_id} if user.major_id else {}),
+    }
+
+
+def get_current_claims(uids: list) -> dict:
+    """Map UID -> current custom claims for these Firebase users (one get_users request)"""
+    result = auth.get_users([auth.UidIdentifier(uid) for uid in uids])
+    return {u.uid: u.custom_claims or {} for u in result.users}
+
+
 async def update_claims():
     if not initialize_firebase():
         print("❌ Failed to initialize Firebase. Please check your credentials.")
         return
 
-    async for db in get_db():
-        try:
-            result = await db.execute(select(User).where(User.status == "active"))
-            users = result.scalars().all()
-            print(f"📊 Found {len(users)} active users in PostgreSQL\n")
-
-            updated = 0
-            skipped = 0
-            errors = 0
-
-            for user in users:
-                try:
-                    if not user.firebase_uid:
-                        print(f"⚠️  Skipping {user.username}: no firebase_uid set")
-                        skipped += 1
-                        continue
-
-                    raw_role = user.role.value if hasattr(user.role, 'value') else user.role
-                    if raw_role == 'admin':
-                        role_value = 'super_admin'
-                    else:
-                        role_value = raw_role
-
-                    claims = {
-                        "roles": [role_value],
-                        "db_user_id": user.id,
-                        "username": user.username
-                    }
-                    if user.campus_id:
-                        claims["campus_id"] = user.campus_id
-                    if user.major_id:
-                        claims["major_id"] = user.major_id
-
-                    FirebaseService.set_custom_user_claims(user.firebase_uid, claims)
-                    print(f"✅ Updated claims for {user.username} ({user.firebase_uid}) -> roles: {claims['roles']}")
-                    updated += 1
-
-                except Exception as e:
-                    print(f"❌ Error updating {user.username}: {e}")
-                    errors += 1
-
-            print("\n" + "="*60)
-            print(f"📊 Summary: Updated: {updated}  Skipped: {skipped}  Errors: {errors}")
-            print("="*60 + "\n")
-
-        finally:
-            await db.close()
-            break
+    # The session is only needed for the SELECT: close it before any Firebase calls
+    async with script_session() as db:
+        # Only the columns the claims need, as plain rows rather than full User objects
+        result = await db.execute(
+            select(
+                User.id, User.username, User.role, User.firebase_uid, User.campus_id, User.major_id
+            ).where(User.status == "active")
+        )
+        users = result.all()
+    print(f"📊 Found {len(users)} active users in PostgreSQL\n")
+
+    updated = 0
+    skipped = 0
+    errors = 0
+
+    to_update = []
+    for user in users:
+        if not user.firebase_uid:
+            print(f"⚠️  Skipping {user.username}: no firebase_uid set")
+            skipped += 1
+            continue
+        to_update.append((user, build_claims(user)))
+
+    # Fetch current claims 100 users per request and skip writes that would change nothing.
+    # A failed lookup leaves its users out of current_claims, so they are rewritten anyway
+    uids = [user.firebase_uid for user, _ in to_update]
+    chunks = [uids[start:start + FIREBASE_LOOKUP_LIMIT] for start in range(0, len(uids), FIREBASE_LOOKUP_LIMIT)]
+    current_claims = {}
+    for chunk, found in zip(chunks, await run_concurrently(get_current_claims, chunks)):
+        if isinstance(found, Exception):
+            print(f"⚠️  Could not read current claims for {len(chunk)} users, rewriting them: {found}")
+            continue
+        current_claims.update(found)
+    unchanged = [
+        (user, claims) for user, claims in to_update
+        if current_claims.get(user.firebase_uid) == claims
+    ]
+    to_update = [
+        (user, claims) for user, claims in to_update
+        if current_claims.get(user.firebase_uid) != claims
+    ]
+    for user, _ in unchanged:
+        print(f"⏭️  Claims already up to date for {user.username}")
+    skipped += len(unchanged)
+
+    # set_custom_user_claims is a blocking HTTPS request with no bulk variant
+    results = await run_concurrently(
+        lambda pair: FirebaseService.set_custom_user_claims(pair[0].firebase_uid, pair[1]), to_update
+    )
+
+    for (user, claims), result in zip(to_update, results):
+        if isinstance(result, Exception):
+            print(f"❌ Error updating {user.username}: {result}")
+            errors += 1
+            continue
+        print(f"✅ Updated claims for {user.username} ({user.firebase_uid}) -> roles: {claims['roles']}")
+        updated += 1
+
+    print("\n" + "="*60)
+    print(f"📊 Summary: Updated: {updated}  Skipped: {skipped}  Errors: {errors}")
+    print("="*60 + "\n")
 
 
 if __name__ == '__main__':
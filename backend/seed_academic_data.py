@@ -3,20 +3,38 @@ Seed academic data for the Academic Management System
 Creates: Semesters, Programs, Courses, Sections, Schedules, Enrollments, Attendance, Grades
 """
 import asyncio
+import os
+from bisect import bisect_right
 from datetime import datetime, timedelta, time
 import random
-from sqlalchemy import select, text
-from app.core.database import AsyncSessionLocal
+from collections import defaultdict
+from sqlalchemy import select, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.database import script_session
 from app.models.academic import (
     Semester, Course, CourseSection, SectionSchedule,
     Enrollment, Attendance, Grade, GradeStatus, AttendanceComplianceLevel
 )
 from app.models.user import Major
 
+# Seeded grades cycle through every approval state, in workflow order
+GRADE_STATUS_CYCLE = (
+    GradeStatus.DRAFT, GradeStatus.SUBMITTED, GradeStatus.UNDER_REVIEW,
+    GradeStatus.APPROVED, GradeStatus.PUBLISHED
+)
+REVIEWED_GRADE_STATUSES = frozenset({
+    GradeStatus.UNDER_REVIEW, GradeStatus.APPROVED, GradeStatus.PUBLISHED
+})
+
+# Override with SEED_RNG=<int> to generate a different (but still reproducible) data set
+DEFAULT_RNG_SEED = 42
+
 async def seed_academic_data():
     print("\n🎓 Seeding Academic Management Data...")
+    # One seeded generator for every draw: reruns produce the same sections, enrollments and grades
+    rng = random.Random(int(os.getenv('SEED_RNG', DEFAULT_RNG_SEED)))
     
-    async with AsyncSessionLocal() as session:
+    async with script_session() as session:
         # Get campuses and users
         result = await session.execute(text("SELECT id, name FROM campuses ORDER BY id"))
         campuses = result.fetchall()
@@ -78,14 +96,16 @@ async def seed_academic_data():
             }
         ]
         
-        semester_objects = []
-        for sem_data in semesters_data:
-            semester = Semester(**sem_data)
-            session.add(semester)
-            semester_objects.append(semester)
-        
-        await session.flush()
-        print(f"✅ Created {len(semester_objects)} semesters")
+        # ON CONFLICT DO NOTHING so a rerun doesn't fail on semesters.code; read the rows back either way
+        await session.execute(
+            pg_insert(Semester).on_conflict_do_nothing(index_elements=['code']),
+            semesters_data
+        )
+        result = await session.execute(
+            select(Semester).where(Semester.code.in_([s['code'] for s in semesters_data]))
+        )
+        semester_objects = result.scalars().all()
+        print(f"✅ Using {len(semester_objects)} semesters")
         
         # Get current semester
         current_semester = [s for s in semester_objects if s.is_current][0]
@@ -120,24 +140,26 @@ async def seed_academic_data():
             }
         ]
         
+        # One query for every code that already exists, then create the rest
+        result = await session.execute(
+            select(Major).where(Major.code.in_([m['code'] for m in majors_data]))
+        )
+        existing_majors = {m.code: m for m in result.scalars().all()}
+        
         major_objects = []
-        majors_created = 0
+        new_majors = []
         for major_data in majors_data:
-            # Check if major already exists
-            result = await session.execute(
-                select(Major).where(Major.code == major_data['code'])
-            )
-            existing_major = result.scalar_one_or_none()
-            
-            if existing_major:
-                major_objects.append(existing_major)
-            else:
+            major = existing_majors.get(major_data['code'])
+            if major is None:
                 major = Major(**major_data)
-                session.add(major)
-                major_objects.append(major)
-                majors_created += 1
+                new_majors.append(major)
+            major_objects.append(major)
+        majors_created = len(new_majors)
         
-        await session.flush()
+        # Flush only when there are new majors: courses need their ids
+        if new_majors:
+            session.add_all(new_majors)
+            await session.flush()
         print(f"✅ Using {len(major_objects)} majors ({majors_created} created, {len(major_objects) - majors_created} existing)")
         
         # 3. CREATE COURSES
@@ -164,172 +186,195 @@ async def seed_academic_data():
             {'course_code': 'DS201', 'name': 'Machine Learning', 'major': 3, 'credits': 4, 'level': 2},
         ]
         
-        course_objects = []
-        for i, course_data in enumerate(courses_data):
+        course_rows = []
+        for course_data in courses_data:
             major_idx = course_data.pop('major')
-            course = Course(
+            course_rows.append({
                 **course_data,
-                major_id=major_objects[major_idx].id,
-                description=f"Course description for {course_data['name']}",
-                is_active=True
-            )
-            session.add(course)
-            course_objects.append(course)
+                'major_id': major_objects[major_idx].id,
+                'description': f"Course description for {course_data['name']}",
+                'is_active': True
+            })
         
-        await session.flush()
-        print(f"✅ Created {len(course_objects)} courses")
+        await session.execute(
+            pg_insert(Course).on_conflict_do_nothing(index_elements=['course_code']),
+            course_rows
+        )
+        result = await session.execute(
+            select(Course)
+            .where(Course.course_code.in_([c['course_code'] for c in course_rows]))
+            .order_by(Course.id)
+        )
+        course_objects = result.scalars().all()
+        print(f"✅ Using {len(course_objects)} courses")
         
         # 4. CREATE SECTIONS
         print("\n👥 Creating course sections...")
-        section_objects = []
+        section_rows = []
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
         rooms = ['Room 101', 'Room 102', 'Room 201', 'Room 202', 'Lab A', 'Lab B', 'Hall 301']
         
         for i, course in enumerate(course_objects):
             # Create 1-2 sections per course
-            num_sections = random.randint(1, 2)
+            num_sections = rng.randint(1, 2)
             for section_num in range(1, num_sections + 1):
-                capacity = random.choice([30, 40, 50])
+                capacity = rng.choice([30, 40, 50])
                 # Create schedule data
-                num_meetings = random.randint(2, 3)
-                selected_days = random.sample(days, num_meetings)
+                num_meetings = rng.randint(2, 3)
+                selected_days = rng.sample(days, num_meetings)
                 schedule_data = []
                 for day in selected_days:
-                    start_hour = random.randint(8, 16)
+                    start_hour = rng.randint(8, 16)
                     schedule_data.append({
                         'day': day,
                         'start_time': f"{start_hour:02d}:00",
                         'end_time': f"{(start_hour + 2):02d}:00",
-                        'room': random.choice(rooms)
+                        'room': rng.choice(rooms)
                     })
                 
-                section = CourseSection(
-                    course_id=course.id,
-                    section_code=f"S{section_num:02d}",
-                    semester_id=current_semester.id,
-                    instructor_id=random.choice(teacher_ids) if teacher_ids else None,
-                    max_students=capacity,
-                    enrolled_count=0,
-                    room=random.choice(rooms),
-                    schedule=schedule_data,
-                    is_active=True
-                )
-                session.add(section)
-                section_objects.append(section)
+                section_rows.append({
+                    'course_id': course.id,
+                    'section_code': f"S{section_num:02d}",
+                    'semester_id': current_semester.id,
+                    'instructor_id': rng.choice(teacher_ids) if teacher_ids else None,
+                    'max_students': capacity,
+                    'enrolled_count': 0,
+                    'room': rng.choice(rooms),
+                    'schedule': schedule_data,
+                    'is_active': True
+                })
         
-        await session.flush()
+        # Sections that already exist (uq_section) are skipped; RETURNING yields only the new ones,
+        # so a rerun doesn't enroll students into the same sections again
+        result = await session.execute(
+            pg_insert(CourseSection)
+            .on_conflict_do_nothing(index_elements=['course_id', 'semester_id', 'section_code'])
+            .returning(CourseSection),
+            section_rows
+        )
+        section_objects = result.scalars().all()
         print(f"✅ Created {len(section_objects)} course sections")
         
         # 5. CREATE ENROLLMENTS
         print("\n📝 Creating enrollments...")
         if student_ids:
-            enrollment_objects = []
+            enrollment_rows = []
             for section in section_objects:
                 # Enroll 60-90% of capacity
-                num_students = int(section.max_students * random.uniform(0.6, 0.9))
-                selected_students = random.sample(student_ids, min(num_students, len(student_ids)))
+                num_students = int(section.max_students * rng.uniform(0.6, 0.9))
+                selected_students = rng.sample(student_ids, min(num_students, len(student_ids)))
                 
                 for student_id in selected_students:
-                    enrollment = Enrollment(
-                        student_id=student_id,
-                        section_id=section.id,
-                        semester_id=current_semester.id,
-                        enrollment_date=current_semester.start_date + timedelta(days=random.randint(0, 10)),
-                        status='active'
-                    )
-                    session.add(enrollment)
-                    enrollment_objects.append(enrollment)
+                    enrollment_rows.append({
+                        'student_id': student_id,
+                        'section_id': section.id,
+                        'semester_id': current_semester.id,
+                        'enrollment_date': current_semester.start_date + timedelta(days=rng.randint(0, 10)),
+                        'status': 'active'
+                    })
                 
-                # Update enrolled_count for each section
-                section.enrolled_count = len([e for e in enrollment_objects if e.section_id == section.id])
+                section.enrolled_count = len(selected_students)
             
-            await session.flush()
+            # One multi-row INSERT ... RETURNING; the ids are needed for attendance and grades
+            enrollment_objects = []
+            if enrollment_rows:
+                result = await session.execute(
+                    insert(Enrollment).returning(Enrollment, sort_by_parameter_order=True),
+                    enrollment_rows
+                )
+                enrollment_objects = result.scalars().all()
             print(f"✅ Created {len(enrollment_objects)} enrollments")
             
             # 6. CREATE ATTENDANCE RECORDS
             print("\n✅ Creating attendance records...")
-            attendance_count = 0
+            attendance_records = []
+            # Tallied while generating, so grades don't have to read attendance back per enrollment
+            present_by_enrollment = defaultdict(int)
             # Assume 10 sessions have occurred so far
             num_sessions = 10
+            # Same dates for every enrollment: compute them once, not per record
+            session_dates = [
+                current_semester.start_date + timedelta(days=session_num * 3)
+                for session_num in range(1, num_sessions + 1)
+            ]
             
             for enrollment in enrollment_objects:
-                for session_num in range(1, num_sessions + 1):
+                for session_num, session_date in enumerate(session_dates, start=1):
                     # Create varied attendance patterns
-                    attendance_percentage = random.random()
+                    attendance_percentage = rng.random()
                     
                     if attendance_percentage < 0.15:  # 15% of students have poor attendance
-                        is_present = random.random() < 0.3  # Only 30% attendance
+                        is_present = rng.random() < 0.3  # Only 30% attendance
                     elif attendance_percentage < 0.30:  # 15% at risk (50-74%)
-                        is_present = random.random() < 0.65  # 65% attendance
+                        is_present = rng.random() < 0.65  # 65% attendance
                     else:  # 70% have good attendance
-                        is_present = random.random() < 0.90  # 90% attendance
+                        is_present = rng.random() < 0.90  # 90% attendance
                     
-                    attendance = Attendance(
-                        enrollment_id=enrollment.id,
-                        section_id=enrollment.section_id,
-                        date=current_semester.start_date + timedelta(days=session_num * 3),
-                        is_present=is_present,
-                        is_locked=session_num < 5  # Lock older records
-                    )
-                    session.add(attendance)
-                    attendance_count += 1
+                    present_by_enrollment[enrollment.id] += is_present
+                    attendance_records.append((
+                        enrollment.id,
+                        enrollment.section_id,
+                        session_date,
+                        is_present,
+                        session_num < 5  # Lock older records
+                    ))
             
-            await session.flush()
+            # Attendance is the largest table here (enrollments x sessions): stream it with COPY
+            # on the session's own connection, so it stays in the same transaction
+            if attendance_records:
+                conn = await session.connection()
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    Attendance.__tablename__,
+                    records=attendance_records,
+                    columns=['enrollment_id', 'section_id', 'date', 'is_present', 'is_locked']
+                )
+            attendance_count = len(attendance_records)
             print(f"✅ Created {attendance_count} attendance records")
             
             # 7. CREATE GRADES
             print("\n📊 Creating grades...")
+            grade_rows = []
+            now = datetime.now()
             
             for idx, enrollment in enumerate(enrollment_objects):
-                # Calculate attendance
-                result = await session.execute(
-                    select(Attendance).where(Attendance.enrollment_id == enrollment.id)
-                )
-                attendance_records = result.scalars().all()
+                # Calculate attendance (every enrollment got num_sessions records above)
+                present_count = present_by_enrollment[enrollment.id]
+                attendance_rate = (present_count / num_sessions) * 100
                 
-                if attendance_records:
-                    present_count = sum(1 for a in attendance_records if a.is_present)
-                    total_sessions = len(attendance_records)
-                    attendance_rate = (present_count / total_sessions) * 100
-                    
-                    # Generate grade based on attendance
-                    if attendance_rate < 25:
-                        grade_value = 0  # Auto-fail
-                    elif attendance_rate < 50:
-                        grade_value = random.uniform(40, 55)
-                    elif attendance_rate < 75:
-                        grade_value = random.uniform(50, 70)
-                    else:
-                        grade_value = random.uniform(70, 95)
-                    
-                    # Determine grade status (mix of statuses for testing)
-                    if idx % 5 == 0:
-                        status = GradeStatus.DRAFT
-                    elif idx % 5 == 1:
-                        status = GradeStatus.SUBMITTED
-                    elif idx % 5 == 2:
-                        status = GradeStatus.UNDER_REVIEW
-                    elif idx % 5 == 3:
-                        status = GradeStatus.APPROVED
-                    else:
-                        status = GradeStatus.PUBLISHED
-                    
-                    grade = Grade(
-                        enrollment_id=enrollment.id,
-                        section_id=enrollment.section_id,
-                        grade_value=round(grade_value, 2),
-                        grade_letter=get_letter_grade(grade_value),
-                        approval_status=status,
-                        submitted_at=datetime.now() if status != GradeStatus.DRAFT else None,
-                        reviewed_at=datetime.now() if status in [GradeStatus.UNDER_REVIEW, GradeStatus.APPROVED, GradeStatus.PUBLISHED] else None,
-                        reviewed_by=admin_ids[0] if admin_ids and status in [GradeStatus.UNDER_REVIEW, GradeStatus.APPROVED, GradeStatus.PUBLISHED] else None,
-                        published_at=datetime.now() if status == GradeStatus.PUBLISHED else None
-                    )
-                    session.add(grade)
-            
-            await session.commit()
+                # Generate grade based on attendance
+                if attendance_rate < 25:
+                    grade_value = 0  # Auto-fail
+                elif attendance_rate < 50:
+                    grade_value = rng.uniform(40, 55)
+                elif attendance_rate < 75:
+                    grade_value = rng.uniform(50, 70)
+                else:
+                    grade_value = rng.uniform(70, 95)
+                
+                # Determine grade status (mix of statuses for testing)
+                status = GRADE_STATUS_CYCLE[idx % len(GRADE_STATUS_CYCLE)]
+                reviewed = status in REVIEWED_GRADE_STATUSES
+                
+                grade_rows.append({
+                    'enrollment_id': enrollment.id,
+                    'section_id': enrollment.section_id,
+                    'grade_value': round(grade_value, 2),
+                    'grade_letter': get_letter_grade(grade_value),
+                    'approval_status': status,
+                    'submitted_at': now if status != GradeStatus.DRAFT else None,
+                    'reviewed_at': now if reviewed else None,
+                    'reviewed_by': admin_ids[0] if admin_ids and reviewed else None,
+                    'published_at': now if status == GradeStatus.PUBLISHED else None
+                })
+        
+            if grade_rows:
+                await session.execute(insert(Grade), grade_rows)
             print(f"✅ Created grades for all enrollments")
         
+        # Single commit for the whole seed (also when there are no students to enroll)
+        await session.commit()
+        
         print("\n🎉 Academic data seeding complete!")
         print("\n📊 Summary:")
         print(f"   • {len(semester_objects)} semesters")
@@ -341,18 +386,13 @@ async def seed_academic_data():
             print(f"   • {attendance_count} attendance records")
             print(f"   • {len(enrollment_objects)} grades")
 
+# Lower bounds of D, C, B, A; anything below 60 is F
+LETTER_GRADE_THRESHOLDS = (60, 70, 80, 90)
+LETTER_GRADES = 'FDCBA'
+
 def get_letter_grade(grade_value: float) -> str:
     """Convert numeric grade to letter grade"""
-    if grade_value >= 90:
-        return 'A'
-    elif grade_value >= 80:
-        return 'B'
-    elif grade_value >= 70:
-        return 'C'
-    elif grade_value >= 60:
-        return 'D'
-    else:
-        return 'F'
+    return LETTER_GRADES[bisect_right(LETTER_GRADE_THRESHOLDS, grade_value)]
 
 if __name__ == "__main__":
     asyncio.run(seed_academic_data())
@@ -4,8 +4,9 @@ Seed enrollments, attendance records, and grades for existing sections
 import asyncio
 from datetime import datetime, timedelta
 import random
-from sqlalchemy import select
-from app.core.database import AsyncSessionLocal
+from collections import defaultdict
+from sqlalchemy import select, insert
+from app.core.database import script_session
 from app.models.academic import (
     Semester, CourseSection, Enrollment, Attendance, Grade, GradeStatus
 )
@@ -14,7 +15,7 @@ from app.models.user import User
 async def seed_full_academic_data():
     print("\n🎓 Seeding Complete Academic Data...")
     
-    async with AsyncSessionLocal() as session:
+    async with script_session() as session:
         # Get current semester
         result = await session.execute(
             select(Semester).where(Semester.is_current == True)
@@ -53,7 +54,7 @@ async def seed_full_academic_data():
         
         # 1. CREATE ENROLLMENTS
         print("\n📝 Creating enrollments...")
-        enrollment_objects = []
+        enrollment_rows = []
         
         for section in sections:
             # Enroll 60-95% of capacity
@@ -67,26 +68,38 @@ async def seed_full_academic_data():
             )
             
             for student_id in available_students:
-                enrollment = Enrollment(
-                    student_id=student_id,
-                    course_section_id=section.id,
-                    enrollment_date=current_semester.start_date + timedelta(days=random.randint(0, 10)),
-                    status='enrolled'
-                )
-                session.add(enrollment)
-                enrollment_objects.append(enrollment)
+                enrollment_rows.append({
+                    'student_id': student_id,
+                    'course_section_id': section.id,
+                    'enrollment_date': current_semester.start_date + timedelta(days=random.randint(0, 10)),
+                    'status': 'enrolled'
+                })
             
             # Update section enrolled_count
             section.enrolled_count = len(available_students)
         
-        await session.flush()
+        # One multi-row INSERT ... RETURNING; the ids are needed for attendance and grades
+        enrollment_objects = []
+        if enrollment_rows:
+            result = await session.execute(
+                insert(Enrollment).returning(Enrollment, sort_by_parameter_order=True),
+                enrollment_rows
+            )
+            enrollment_objects = result.scalars().all()
         print(f"✅ Created {len(enrollment_objects)} enrollments")
         
         # 2. CREATE ATTENDANCE RECORDS
         print("\n✅ Creating attendance records...")
-        attendance_count = 0
+        attendance_records = []
+        # Tallied while generating, so grades don't have to read attendance back per enrollment
+        present_by_enrollment = defaultdict(int)
         # Assume 15 class sessions have occurred
         num_sessions = 15
+        # Same dates for every enrollment: compute them once, not per record
+        session_dates = [
+            current_semester.start_date + timedelta(days=session_num * 3)
+            for session_num in range(1, num_sessions + 1)
+        ]
         
         # Create attendance patterns for different student types
         for idx, enrollment in enumerate(enrollment_objects):
@@ -103,102 +116,109 @@ async def seed_full_academic_data():
                 base_attendance_rate = random.uniform(0.75, 0.98)
             
             # Create attendance records
-            for session_num in range(1, num_sessions + 1):
+            for session_date in session_dates:
                 # Add some randomness to attendance
                 is_present = random.random() < base_attendance_rate
+                present_by_enrollment[enrollment.id] += is_present
                 
-                attendance = Attendance(
-                    enrollment_id=enrollment.id,
-                    date=current_semester.start_date + timedelta(days=session_num * 3),
-                    status='present' if is_present else 'absent'
-                )
-                session.add(attendance)
-                attendance_count += 1
-        
-        await session.flush()
+                attendance_records.append((
+                    enrollment.id,
+                    session_date,
+                    'present' if is_present else 'absent'
+                ))
+        
+        # One COPY stream on the session's own connection (same transaction) instead of
+        # an ORM INSERT per record
+        if attendance_records:
+            conn = await session.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                Attendance.__tablename__,
+                records=attendance_records,
+                columns=['enrollment_id', 'date', 'status']
+            )
+        attendance_count = len(attendance_records)
         print(f"✅ Created {attendance_count} attendance records")
         
         # 3. CREATE GRADES
         print("\n📊 Creating grades with workflow states...")
-        grades_created = 0
+        grade_rows = []
+        # One timestamp for the whole phase; workflow dates are random offsets from it
+        now = datetime.now()
         
         for idx, enrollment in enumerate(enrollment_objects):
-            # Calculate attendance rate
-            result = await session.execute(
-                select(Attendance).where(Attendance.enrollment_id == enrollment.id)
-            )
-            attendance_records = result.scalars().all()
+            # Calculate attendance rate (every enrollment got num_sessions records above)
+            present_count = present_by_enrollment[enrollment.id]
+            attendance_rate = (present_count / num_sessions) * 100
             
-            if attendance_records:
-                present_count = sum(1 for a in attendance_records if a.status == 'present')
-                total_sessions = len(attendance_records)
-                attendance_rate = (present_count / total_sessions) * 100
-                
-                # Generate grade based on attendance
-                if attendance_rate < 25:
-                    grade_value = 0  # Auto-fail
-                elif attendance_rate < 50:
-                    grade_value = random.uniform(40, 55)  # Failing but tried
-                elif attendance_rate < 75:
-                    grade_value = random.uniform(55, 75)  # Passing to average
-                else:
-                    grade_value = random.uniform(70, 95)  # Good to excellent
-                
-                # Distribute across different workflow states
-                # 20% Draft, 20% Submitted, 20% Under Review, 20% Approved, 20% Published
-                state_selector = idx % 5
-                
-                if state_selector == 0:
-                    status = "draft"
-                    submitted_at = None
-                    reviewed_at = None
-                    reviewed_by = None
-                    published_at = None
-                elif state_selector == 1:
-                    status = "submitted"
-                    submitted_at = datetime.now() - timedelta(days=random.randint(1, 10))
-                    reviewed_at = None
-                    reviewed_by = None
-                    published_at = None
-                elif state_selector == 2:
-                    status = "under_review"
-                    submitted_at = datetime.now() - timedelta(days=random.randint(5, 15))
-                    reviewed_at = datetime.now() - timedelta(days=random.randint(1, 5))
-                    reviewed_by = admin_ids[0] if admin_ids else None
-                    published_at = None
-                elif state_selector == 3:
-                    status = "approved"
-                    submitted_at = datetime.now() - timedelta(days=random.randint(10, 20))
-                    reviewed_at = datetime.now() - timedelta(days=random.randint(5, 10))
-                    reviewed_by = admin_ids[0] if admin_ids else None
-                    published_at = None
-                else:
-                    status = "published"
-                    submitted_at = datetime.now() - timedelta(days=random.randint(15, 30))
-                    reviewed_at = datetime.now() - timedelta(days=random.randint(10, 20))
-                    reviewed_by = admin_ids[0] if admin_ids else None
-                    published_at = datetime.now() - timedelta(days=random.randint(1, 5))
-                
-                # Create a midterm grade
-                # Note: grade_value is NUMERIC(3,2) so max is 9.99
-                # Store as percentage: 0-1.0 (where 1.0 = 100%)
-                grade_percentage = grade_value / 100.0  # Convert 0-100 to 0-1.0
-                
-                grade = Grade(
-                    enrollment_id=enrollment.id,
-                    assignment_name="Midterm Exam",
-                    grade_value=round(grade_percentage, 2),  # 0.00 to 1.00
-                    max_grade=1.0,  # Max is 1.0 (100%)
-                    weight=0.30,  # 30% weight as decimal
-                    graded_at=datetime.now() - timedelta(days=random.randint(10, 30)),
-                    approval_status=status,
-                    submitted_at=submitted_at,
-                    reviewed_at=reviewed_at,
-                    reviewed_by=reviewed_by,
-                    published_at=published_at
-                )
-                session.add(grade)
-                grades_created += 1
+            # Generate grade based on attendance
+            if attendance_rate < 25:
+                grade_value = 0  # Auto-fail
+            elif attendance_rate < 50:
+                grade_value = random.uniform(40, 55)  # Failing but tried
+            elif attendance_rate < 75:
+                grade_value = random.uniform(55, 75)  # Passing to average
+            else:
+                grade_value = random.uniform(70, 95)  # Good to excellent
+            
+            # Distribute across different workflow states
+            # 20% Draft, 20% Submitted, 20% Under Review, 20% Approved, 20% Published
+            state_selector = idx % 5
+            
+            if state_selector == 0:
+                status = "draft"
+                submitted_at = None
+                reviewed_at = None
+                reviewed_by = None
+                published_at = None
+            elif state_selector == 1:
+                status = "submitted"
+                submitted_at = now - timedelta(days=random.randint(1, 10))
+                reviewed_at = None
+                reviewed_by = None
+                published_at = None
+            elif state_selector == 2:
+                status = "under_review"
+                submitted_at = now - timedelta(days=random.randint(5, 15))
+                reviewed_at = now - timedelta(days=random.randint(1, 5))
+                reviewed_by = admin_ids[0] if admin_ids else None
+                published_at = None
+            elif state_selector == 3:
+                status = "approved"
+                submitted_at = now - timedelta(days=random.randint(10, 20))
+                reviewed_at = now - timedelta(days=random.randint(5, 10))
+                reviewed_by = admin_ids[0] if admin_ids else None
+                published_at = None
+            else:
+                status = "published"
+                submitted_at = now - timedelta(days=random.randint(15, 30))
+                reviewed_at = now - timedelta(days=random.randint(10, 20))
+                reviewed_by = admin_ids[0] if admin_ids else None
+                published_at = now - timedelta(days=random.randint(1, 5))
+            
+            # Create a midterm grade
+            # Note: grade_value is NUMERIC(3,2) so max is 9.99
+            # Store as percentage: 0-1.0 (where 1.0 = 100%)
+            grade_percentage = grade_value / 100.0  # Convert 0-100 to 0-1.0
+            
+            grade_rows.append({
+                'enrollment_id': enrollment.id,
+                'assignment_name': "Midterm Exam",
+                'grade_value': round(grade_percentage, 2),  # 0.00 to 1.00
+                'max_grade': 1.0,  # Max is 1.0 (100%)
+                'weight': 0.30,  # 30% weight as decimal
+                'graded_at': now - timedelta(days=random.randint(10, 30)),
+                'approval_status': status,
+                'submitted_at': submitted_at,
+                'reviewed_at': reviewed_at,
+                'reviewed_by': reviewed_by,
+                'published_at': published_at
+            })
+    
+        # Nothing reads the grades back: plain executemany, no ORM objects
+        if grade_rows:
+            await session.execute(insert(Grade), grade_rows)
+        grades_created = len(grade_rows)
         
         await session.commit()
         print(f"✅ Created {grades_created} grades")
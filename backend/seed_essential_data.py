@@ -4,16 +4,16 @@ Seed essential data for admin portal pages to show content
 import asyncio
 from datetime import datetime, timedelta
 import random
-from app.core.database import AsyncSessionLocal
+from app.core.database import script_session
 from app.models.document import Document, Announcement
 from app.models.finance import Invoice
 from app.models.communication import SupportTicket
-from sqlalchemy import select
+from sqlalchemy import select, insert
 
 async def seed_data():
     print("\n🌱 Seeding essential data...")
     
-    async with AsyncSessionLocal() as session:
+    async with script_session() as session:
         # Get users for foreign keys
         from sqlalchemy import text
         result = await session.execute(text("SELECT id, role FROM users ORDER BY id"))
@@ -30,6 +30,9 @@ async def seed_data():
         
         print(f"✅ Found {len(users)} users")
         
+        # One timestamp for the whole run; every seeded date is a random offset from it
+        now = datetime.now()
+        
         # 1. DOCUMENTS (Course Materials)
         print("\n📄 Creating documents...")
         doc_types = ['syllabus', 'lecture_note', 'assignment', 'exam']
@@ -46,20 +49,20 @@ async def seed_data():
             'Operating Systems Course Outline'
         ]
         
+        document_rows = []
         for i, title in enumerate(doc_titles):
-            doc = Document(
-                user_id=random.choice(teacher_ids) if teacher_ids else admin_ids[0],
-                title=title,
-                document_type=doc_types[i % len(doc_types)],
-                file_url=f'https://storage.greenwich.edu.vn/documents/doc_{i+1}.pdf',
-                file_size=random.randint(100000, 5000000),
-                mime_type='application/pdf',
-                status='active',
-                uploaded_by=random.choice(admin_ids) if admin_ids else users[0][0]
-            )
-            session.add(doc)
-        
-        await session.commit()
+            document_rows.append({
+                'user_id': random.choice(teacher_ids) if teacher_ids else admin_ids[0],
+                'title': title,
+                'document_type': doc_types[i % len(doc_types)],
+                'file_url': f'https://storage.greenwich.edu.vn/documents/doc_{i+1}.pdf',
+                'file_size': random.randint(100000, 5000000),
+                'mime_type': 'application/pdf',
+                'status': 'active',
+                'uploaded_by': random.choice(admin_ids) if admin_ids else users[0][0]
+            })
+        
+        await session.execute(insert(Document), document_rows)
         print(f"✅ Created {len(doc_titles)} documents")
         
         # 2. ANNOUNCEMENTS
@@ -123,19 +126,19 @@ async def seed_data():
             }
         ]
         
+        announcement_rows = []
         for i, ann_data in enumerate(announcements_data):
-            ann = Announcement(
-                author_id=random.choice(admin_ids) if admin_ids else users[0][0],
-                title=ann_data['title'],
-                content=ann_data['content'],
-                target_audience=ann_data['target_audience'],
-                is_published=ann_data['is_published'],
-                publish_date=datetime.now() - timedelta(days=random.randint(1, 30)),
-                created_at=datetime.now() - timedelta(days=random.randint(1, 30))
-            )
-            session.add(ann)
-        
-        await session.commit()
+            announcement_rows.append({
+                'author_id': random.choice(admin_ids) if admin_ids else users[0][0],
+                'title': ann_data['title'],
+                'content': ann_data['content'],
+                'target_audience': ann_data['target_audience'],
+                'is_published': ann_data['is_published'],
+                'publish_date': now - timedelta(days=random.randint(1, 30)),
+                'created_at': now - timedelta(days=random.randint(1, 30))
+            })
+        
+        await session.execute(insert(Announcement), announcement_rows)
         print(f"✅ Created {len(announcements_data)} announcements")
         
         # 3. INVOICES
@@ -146,25 +149,26 @@ async def seed_data():
         semester = result.fetchone()
         semester_id = semester[0] if semester else None
         
+        invoice_rows = []
         for i, student_id in enumerate(student_ids[:15] if len(student_ids) > 15 else student_ids):
             base_amount = random.choice([15000000, 17500000, 20000000])  # VND
             paid_amount = random.choice([0, base_amount // 2, base_amount])
             status = 'paid' if paid_amount >= base_amount else ('partial' if paid_amount > 0 else 'pending')
             
-            invoice = Invoice(
-                student_id=student_id,
-                semester_id=semester_id,
-                invoice_number=f'INV-2025-{str(i+1).zfill(4)}',
-                issued_date=datetime.now() - timedelta(days=random.randint(30, 90)),
-                total_amount=base_amount,
-                paid_amount=paid_amount,
-                due_date=datetime.now() + timedelta(days=random.randint(10, 60)),
-                status=status,
-                notes=f'Spring 2025 Tuition - Student ID {student_id}'
-            )
-            session.add(invoice)
-        
-        await session.commit()
+            invoice_rows.append({
+                'student_id': student_id,
+                'semester_id': semester_id,
+                'invoice_number': f'INV-2025-{str(i+1).zfill(4)}',
+                'issued_date': now - timedelta(days=random.randint(30, 90)),
+                'total_amount': base_amount,
+                'paid_amount': paid_amount,
+                'due_date': now + timedelta(days=random.randint(10, 60)),
+                'status': status,
+                'notes': f'Spring 2025 Tuition - Student ID {student_id}'
+            })
+        
+        if invoice_rows:
+            await session.execute(insert(Invoice), invoice_rows)
         print(f"✅ Created invoices for students")
         
         # 4. SUPPORT TICKETS
@@ -191,24 +195,27 @@ async def seed_data():
         statuses = ['open', 'in_progress', 'resolved', 'closed']
         categories = ['technical', 'academic', 'financial', 'administrative', 'facilities']
         
+        ticket_rows = []
         for i, subject in enumerate(ticket_subjects):
             days_ago = random.randint(1, 60)
-            created = datetime.now() - timedelta(days=days_ago)
+            created = now - timedelta(days=days_ago)
             status = random.choice(statuses)
             
-            ticket = SupportTicket(
-                user_id=random.choice(student_ids) if student_ids else users[0][0],
-                subject=subject,
-                description=f'Detailed description of the issue: {subject}. This needs to be resolved as soon as possible. Thank you.',
-                category=random.choice(categories),
-                priority=random.choice(priorities),
-                status=status,
-                assigned_to=random.choice(admin_ids) if admin_ids and status != 'open' else None,
-                created_at=created,
-                updated_at=created + timedelta(hours=random.randint(1, 48)) if status != 'open' else created
-            )
-            session.add(ticket)
-        
+            ticket_rows.append({
+                'user_id': random.choice(student_ids) if student_ids else users[0][0],
+                'subject': subject,
+                'description': f'Detailed description of the issue: {subject}. This needs to be resolved as soon as possible. Thank you.',
+                'category': random.choice(categories),
+                'priority': random.choice(priorities),
+                'status': status,
+                'assigned_to': random.choice(admin_ids) if admin_ids and status != 'open' else None,
+                'created_at': created,
+                'updated_at': created + timedelta(hours=random.randint(1, 48)) if status != 'open' else created
+            })
+        
+        await session.execute(insert(SupportTicket), ticket_rows)
+        
+        # Single commit: the four phases land together (or not at all)
         await session.commit()
         print(f"✅ Created {len(ticket_subjects)} support tickets")
         
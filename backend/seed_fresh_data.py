@@ -2,17 +2,20 @@
 Fresh database seeding script based on user requirements.
 Clears specific tables and creates new data.
 """
+import argparse
 import asyncio
+import logging
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta, time as datetime_time
 import random
+from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy import text, select, and_, or_, func
+from sqlalchemy import text, select, insert, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import engine, AsyncSessionLocal
+from app.core.database import script_session
 from app.models.academic import Semester, Course, CourseSection, Enrollment, Attendance, Grade
 from app.models.user import User, Campus, Major
 from app.models.role import Role
@@ -21,10 +24,60 @@ from app.models.communication import SupportTicket
 from app.models.document import DocumentRequest, Announcement
 from app.models.audit import AuditLog
 from app.core.security import SecurityUtils
+from app.core.firebase import run_concurrently
 import firebase_admin
 from firebase_admin import credentials, auth as firebase_auth
 
 
+log = logging.getLogger("seed")
+
+# Above this many rows, COPY beats multi-VALUES INSERT (no per-row parse/bind)
+BULK_COPY_THRESHOLD = 100
+
+
+def python_defaults(model, present: set) -> dict:
+    """Column(default=...) factories for the columns missing from a row, or None if one can't be
+    computed client-side (SQL expression defaults). Server defaults are left to the database."""
+    defaults = {}
+    for column in model.__table__.columns:
+        default = column.default
+        if column.key in present or default is None or default.is_sequence:
+            continue
+        if default.is_scalar:
+            defaults[column.key] = lambda value=default.arg: value
+        elif default.is_callable:
+            defaults[column.key] = lambda fn=default.arg: fn(None)
+        else:
+            return None
+    return defaults
+
+
+async def bulk_insert(session: AsyncSession, model, rows: list):
+    """Insert dict rows in one batch: asyncpg COPY for large batches, executemany INSERT otherwise.
+    
+    Rows end up the same either way: COPY bypasses SQLAlchemy, so the model's Python-side
+    defaults are filled in first.
+    """
+    if not rows:
+        return
+    columns = list(rows[0])
+    defaults = python_defaults(model, set(columns)) if len(rows) > BULK_COPY_THRESHOLD else None
+    if defaults is None:
+        await session.execute(insert(model), rows)
+        return
+    # Evaluated per row, as the INSERT path would
+    columns += list(defaults)
+    rows = [{**{key: make() for key, make in defaults.items()}, **r} for r in rows]
+    # COPY on the session's own connection, so it stays in the same transaction
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        model.__tablename__,
+        records=[tuple(r[c] for c in columns) for r in rows],
+        columns=[model.__table__.columns[c].name for c in columns],
+    )
+
+
 # Helper function to create Firebase user
 def create_firebase_user(email: str, password: str, display_name: str):
     """Create Firebase user and return UID."""
@@ -35,22 +88,22 @@ def create_firebase_user(email: str, password: str, display_name: str):
             display_name=display_name,
             email_verified=False
         )
-        print(f"  ✅ Firebase user created: {email}")
+        log.info(f"  ✅ Firebase user created: {email}")
         return user.uid
     except Exception as e:
         # User might already exist, try to get it
         try:
             user = firebase_auth.get_user_by_email(email)
-            print(f"  ⚠️  Firebase user exists: {email}")
+            log.warning(f"  ⚠️  Firebase user exists: {email}")
             return user.uid
         except:
-            print(f"  ❌ Failed to create Firebase user {email}: {e}")
+            log.error(f"  ❌ Failed to create Firebase user {email}: {e}")
             return None
 
 
 async def clear_tables(session: AsyncSession):
     """Clear specific tables as per requirements."""
-    print("\n🗑️  Clearing specified tables...")
+    log.info("\n🗑️  Clearing specified tables...")
     
     tables_to_clear = [
         'audit_logs',  # 4. Clear audit logs
@@ -82,9 +135,9 @@ async def clear_tables(session: AsyncSession):
     for table in tables_to_clear:
         try:
             result = await session.execute(text(f"DELETE FROM {table}"))
-            print(f"  ✅ Cleared {table}: {result.rowcount} rows")
+            log.info(f"  ✅ Cleared {table}: {result.rowcount} rows")
         except Exception as e:
-            print(f"  ⚠️  Error clearing {table}: {e}")
+            log.warning(f"  ⚠️  Error clearing {table}: {e}")
     
     await session.execute(text("SET session_replication_role = 'origin';"))
     
@@ -106,13 +159,8 @@ async def clear_tables(session: AsyncSession):
     ]
     
     for seq in sequences_to_reset:
-        try:
-            await session.execute(text(f"ALTER SEQUENCE {seq} RESTART WITH 1"))
-        except Exception as e:
-            # Sequence might not exist
-            pass
-    
-    await session.commit()
+        # Sequence might not exist; IF EXISTS keeps the shared transaction from aborting
+        await session.execute(text(f"ALTER SEQUENCE IF EXISTS {seq} RESTART WITH 1"))
 
 
 async def get_campuses(session: AsyncSession):
@@ -121,15 +169,15 @@ async def get_campuses(session: AsyncSession):
     return result.scalars().all()
 
 
-async def get_role_by_code(session: AsyncSession, code: str):
-    """Get role by code."""
-    result = await session.execute(select(Role).where(Role.code == code))
-    return result.scalar_one_or_none()
+async def get_role_ids(session: AsyncSession, codes) -> dict:
+    """Map role code -> role id for the given codes, in one query."""
+    result = await session.execute(select(Role.code, Role.id).where(Role.code.in_(codes)))
+    return dict(result.all())
 
 
 async def create_majors(session: AsyncSession):
     """Create new majors."""
-    print("\n📚 Creating majors...")
+    log.info("\n📚 Creating majors...")
     
     majors_data = [
         {"code": "COMP", "name": "Computing", "description": "Computer Science and IT programs"},
@@ -137,22 +185,26 @@ async def create_majors(session: AsyncSession):
         {"code": "GDES", "name": "Graphic Design", "description": "Graphic Design and Visual Arts programs"},
     ]
     
-    majors = []
-    for data in majors_data:
-        major = Major(**data)
-        session.add(major)
-        majors.append(major)
-        print(f"  ✅ Created major: {data['name']}")
-    
-    await session.flush()
+    # Core INSERT ... RETURNING: one statement, and the rows come back with their IDs
+    result = await session.execute(insert(Major).returning(Major), majors_data)
+    majors = result.scalars().all()
+    log.info(f"  ✅ Created majors: {', '.join(m.name for m in majors)}")
     return majors
 
 
-async def create_users(session: AsyncSession, campuses: list):
+async def hash_seed_passwords(bcrypt_rounds: int) -> dict:
+    """Hash the seed passwords in worker threads so bcrypt doesn't block the event loop."""
+    passwords = ("Admin@123", "Student@123", "Teacher@123")
+    hashes = await asyncio.gather(*(
+        asyncio.to_thread(SecurityUtils.hash_password, password, bcrypt_rounds)
+        for password in passwords
+    ))
+    return dict(zip(passwords, hashes))
+
+
+async def create_users(session: AsyncSession, campuses: list, password_hashes: dict):
     """Create users with Vietnamese names: students (including Nguyen Dinh Hieu), teachers, and admins."""
-    print("\n👥 Creating users...")
-    
-    users = []
+    log.info("\n👥 Creating users...")
     
     # Vietnamese names for students (first_name, last_name)
     vietnamese_student_names = {
@@ -193,32 +245,19 @@ async def create_users(session: AsyncSession, campuses: list):
         'Graphic Design': 'D',
     }
     
-    # 1. Create superadmin
-    print("\n  Creating Super Admin...")
-    superadmin_email = "superadmin@greenwich.edu.vn"
-    firebase_uid = create_firebase_user(superadmin_email, "Admin@123", "Super Administrator")
-    
-    superadmin = User(
-        username="super_admin",
-        email=superadmin_email,
-        full_name="Super Administrator",
-        firebase_uid=firebase_uid,
-        role="super_admin",
-        status="active",
-        password_hash=SecurityUtils.hash_password("Admin@123")
-    )
-    session.add(superadmin)
-    await session.flush()
+    # Collect every account first: creating Firebase users doesn't touch the database,
+    # so those HTTPS calls can all run concurrently before the inserts
+    accounts = []
     
-    # Assign super_admin role
-    super_admin_role = await get_role_by_code(session, "super_admin")
-    if super_admin_role:
-        await session.execute(text(
-            "INSERT INTO user_roles (user_id, role_id) VALUES (:user_id, :role_id)"
-        ), {"user_id": superadmin.id, "role_id": super_admin_role.id})
-        print(f"  ✅ Created: {superadmin.username} ({superadmin_email})")
-    
-    users.append(superadmin)
+    # 1. Superadmin
+    accounts.append({
+        "username": "super_admin",
+        "email": "superadmin@greenwich.edu.vn",
+        "full_name": "Super Administrator",
+        "role": "super_admin",
+        "campus": None,
+        "password": "Admin@123",
+    })
     
     # 2. Get all majors to assign students
     result = await session.execute(select(Major))
@@ -229,7 +268,6 @@ async def create_users(session: AsyncSession, campuses: list):
     
     for campus in campuses:
         campus_code = campus.code
-        print(f"\n  Creating users for Campus {campus_code}...")
         
         # Get student names for this campus
         student_names = vietnamese_student_names.get(campus_code, [])
@@ -251,34 +289,16 @@ async def create_users(session: AsyncSession, campuses: list):
             # Generate username: NameInitialsGCampusMajorYYXXXX
             # Example: HieuNDGCD220033 (Hieu ND, Greenwich, Computing, Da Nang)
             first_initial = ''.join([word[0] for word in first_name.split()])
-            last_initial = last_name[0]
             student_username = f"{last_name}{first_initial}G{major_code}{campus_code}22{student_id}"
-            student_email = f"{student_username}@student.greenwich.edu.vn"
-            
-            full_name = f"{first_name} {last_name}"
-            firebase_uid = create_firebase_user(student_email, "Student@123", full_name)
             
-            student = User(
-                username=student_username,
-                email=student_email,
-                full_name=full_name,
-                firebase_uid=firebase_uid,
-                campus_id=campus.id,
-                role="student",
-                status="active",
-                password_hash=SecurityUtils.hash_password("Student@123")
-            )
-            session.add(student)
-            await session.flush()
-            
-            student_role = await get_role_by_code(session, "student")
-            if student_role:
-                await session.execute(text(
-                    "INSERT INTO user_roles (user_id, role_id) VALUES (:user_id, :role_id)"
-                ), {"user_id": student.id, "role_id": student_role.id})
-            
-            print(f"    ✅ Student: {student_username} ({full_name})")
-            users.append(student)
+            accounts.append({
+                "username": student_username,
+                "email": f"{student_username}@student.greenwich.edu.vn",
+                "full_name": f"{first_name} {last_name}",
+                "role": "student",
+                "campus": campus,
+                "password": "Student@123",
+            })
         
         # Create 1 teacher with Vietnamese name
         teacher_first, teacher_last = vietnamese_teacher_names.get(campus_code, ("Dr.", "Teacher"))
@@ -292,67 +312,84 @@ async def create_users(session: AsyncSession, campuses: list):
         middle_last = name_parts[:-1]  # Everything before is middle/last name
         initials = ''.join([n[0].upper() for n in middle_last])
         teacher_username = f"{first_name}{initials}1"
-        teacher_email = f"{teacher_username}@greenwich.edu.vn"
-        firebase_uid = create_firebase_user(teacher_email, "Teacher@123", teacher_full_name)
-        
-        teacher = User(
-            username=teacher_username,
-            email=teacher_email,
-            full_name=teacher_full_name,
-            firebase_uid=firebase_uid,
-            campus_id=campus.id,
-            role="teacher",
-            status="active",
-            password_hash=SecurityUtils.hash_password("Teacher@123")
-        )
-        session.add(teacher)
-        await session.flush()
         
-        teacher_role = await get_role_by_code(session, "teacher")
-        if teacher_role:
-            await session.execute(text(
-                "INSERT INTO user_roles (user_id, role_id) VALUES (:user_id, :role_id)"
-            ), {"user_id": teacher.id, "role_id": teacher_role.id})
-        
-        print(f"    ✅ Teacher: {teacher_username} ({teacher_full_name})")
-        users.append(teacher)
+        accounts.append({
+            "username": teacher_username,
+            "email": f"{teacher_username}@greenwich.edu.vn",
+            "full_name": teacher_full_name,
+            "role": "teacher",
+            "campus": campus,
+            "password": "Teacher@123",
+        })
         
         # Create all admin types
         for admin_type in admin_types:
             admin_username = f"{admin_type}_{campus_code.lower()}"
-            admin_email = f"{admin_username}@greenwich.edu.vn"
             admin_name = admin_type.replace('_', ' ').title()
-            firebase_uid = create_firebase_user(admin_email, "Admin@123", f"{admin_name} {campus_code}")
-            
-            admin = User(
-                username=admin_username,
-                email=admin_email,
-                full_name=f"{admin_name} {campus_code}",
-                firebase_uid=firebase_uid,
-                campus_id=campus.id,
-                role=admin_type,
-                status="active",
-                password_hash=SecurityUtils.hash_password("Admin@123")
-            )
-            session.add(admin)
-            await session.flush()
             
-            admin_role = await get_role_by_code(session, admin_type)
-            if admin_role:
-                await session.execute(text(
-                    "INSERT INTO user_roles (user_id, role_id) VALUES (:user_id, :role_id)"
-                ), {"user_id": admin.id, "role_id": admin_role.id})
-            
-            print(f"    ✅ Admin: {admin_username}")
-            users.append(admin)
+            accounts.append({
+                "username": admin_username,
+                "email": f"{admin_username}@greenwich.edu.vn",
+                "full_name": f"{admin_name} {campus_code}",
+                "role": admin_type,
+                "campus": campus,
+                "password": "Admin@123",
+            })
+    
+    # Firebase Admin calls block: run them in worker threads, a bounded number in flight
+    results = await run_concurrently(
+        lambda account: create_firebase_user(account["email"], account["password"], account["full_name"]),
+        accounts,
+    )
+    firebase_uids = [None if isinstance(uid, Exception) else uid for uid in results]
+    
+    user_rows = [
+        {
+            "username": account["username"],
+            "email": account["email"],
+            "full_name": account["full_name"],
+            "firebase_uid": firebase_uid,
+            "campus_id": account["campus"].id if account["campus"] else None,
+            "role": account["role"],
+            "status": "active",
+            "password_hash": password_hashes[account["password"]],
+        }
+        for account, firebase_uid in zip(accounts, firebase_uids)
+    ]
+    
+    # One INSERT ... RETURNING for every user; rows come back in account order with their IDs
+    result = await session.execute(
+        insert(User).returning(User, sort_by_parameter_order=True), user_rows
+    )
+    users = result.scalars().all()
+    
+    role_ids = await get_role_ids(session, {account["role"] for account in accounts})
+    user_role_rows = [
+        {"user_id": user.id, "role_id": role_ids[user.role]}
+        for user in users if user.role in role_ids
+    ]
+    if user_role_rows:
+        await session.execute(text(
+            "INSERT INTO user_roles (user_id, role_id) VALUES (:user_id, :role_id)"
+        ), user_role_rows)
+    
+    created_names = {}
+    for account, user in zip(accounts, users):
+        campus = account["campus"]
+        if campus is None:
+            log.info(f"  ✅ Created: {user.username} ({user.email})")
+        else:
+            created_names.setdefault(campus.code, []).append(user.username)
+    
+    for campus_code, names in created_names.items():
+        log.info(f"  ✅ Campus {campus_code}: {', '.join(names)}")
     
-    await session.commit()
     return users
 
 
 async def create_courses(session: AsyncSession, majors: list):
     """Create 2 courses for each major."""
-    print("\n📖 Creating courses...")
+    log.info("\n📖 Creating courses...")
     
     course_templates = {
         "Computing": [
@@ -369,25 +406,22 @@ async def create_courses(session: AsyncSession, majors: list):
         ],
     }
     
+    course_rows = [
+        {**template, "major_id": major.id}
+        for major in majors
+        for template in course_templates.get(major.name, [])
+    ]
     courses = []
-    for major in majors:
-        templates = course_templates.get(major.name, [])
-        for template in templates:
-            course = Course(
-                **template,
-                major_id=major.id
-            )
-            session.add(course)
-            courses.append(course)
-            print(f"  ✅ Created: {template['course_code']} - {template['name']}")
-    
-    await session.flush()
+    if course_rows:
+        result = await session.execute(insert(Course).returning(Course), course_rows)
+        courses = result.scalars().all()
+    log.info(f"  ✅ Created {len(courses)} courses: {', '.join(c.course_code for c in courses)}")
     return courses
 
 
 async def create_sections_and_schedules(session: AsyncSession, courses: list, teachers: list, campuses: list):
     """Create 2 sections per course with schedules."""
-    print("\n🏫 Creating course sections and schedules...")
+    log.info("\n🏫 Creating course sections and schedules...")
     
     # Get current semester
     result = await session.execute(
@@ -398,7 +432,7 @@ async def create_sections_and_schedules(session: AsyncSession, courses: list, te
     current_semester = result.scalar_one_or_none()
     
     if not current_semester:
-        print("  ⚠️  No current semester found!")
+        log.warning("  ⚠️  No current semester found!")
         return []
     
     sections = []
@@ -454,35 +488,20 @@ async def create_sections_and_schedules(session: AsyncSession, courses: list, te
             
             sections.append(section)
             section_counter += 1
-            print(f"  ✅ Created: {section_code} ({selected_days[0]} {time_slot[0]}-{time_slot[1]})")
     
     await session.flush()
+    log.info(f"  ✅ Created {len(sections)} sections: {', '.join(s.section_code for s in sections)}")
     return sections
 
 
-async def check_schedule_conflict(session: AsyncSession, student_id: int, section_id: int):
-    """Check if enrolling in this section causes schedule conflict."""
-    # Get the new section's schedule
-    result = await session.execute(
-        select(CourseSection)
-        .where(CourseSection.id == section_id)
-    )
-    new_section = result.scalar_one_or_none()
-    if not new_section or not new_section.schedule:
+def has_schedule_conflict(section, enrolled_sections: list) -> bool:
+    """Check if a section's sessions overlap any already-enrolled section's sessions."""
+    if not section.schedule:
         return False
     
-    new_schedule = new_section.schedule.get('sessions', [])
+    new_schedule = section.schedule.get('sessions', [])
     
-    # Get all student's current enrollments with their schedules
-    result = await session.execute(
-        select(Enrollment, CourseSection)
-        .join(CourseSection, Enrollment.course_section_id == CourseSection.id)
-        .where(Enrollment.student_id == student_id)
-    )
-    enrollments_with_sections = result.all()
-    
-    # Check for conflicts
-    for enrollment, existing_section in enrollments_with_sections:
+    for existing_section in enrolled_sections:
         if not existing_section.schedule:
             continue
             
@@ -500,9 +519,11 @@ async def check_schedule_conflict(session: AsyncSession, student_id: int, sectio
 
 async def enroll_students(session: AsyncSession, students: list, sections: list):
     """Enroll students to sections, checking for conflicts."""
-    print("\n📝 Enrolling students...")
+    log.info("\n📝 Enrolling students...")
     
-    enrollments = []
+    now = datetime.now()
+    
+    enrollment_rows = []
     for student in students:
         # Enroll each student in 4-6 sections
         num_courses = random.randint(4, 6)
@@ -510,47 +531,45 @@ async def enroll_students(session: AsyncSession, students: list, sections: list)
         attempts = 0
         max_attempts = len(sections) * 2
         
-        available_sections = sections.copy()
-        random.shuffle(available_sections)
+        available_sections = random.sample(sections, len(sections))
+        enrolled_sections = []
         
         while enrolled_count < num_courses and attempts < max_attempts:
             if not available_sections:
                 break
                 
-            section = available_sections.pop(0)
+            section = available_sections.pop()
             attempts += 1
             
-            # Check for conflict
-            has_conflict = await check_schedule_conflict(session, student.id, section.id)
-            
-            if not has_conflict:
-                enrollment = Enrollment(
-                    student_id=student.id,
-                    course_section_id=section.id,
-                    enrollment_date=datetime.now(),
-                    status='enrolled'
-                )
-                session.add(enrollment)
-                enrollments.append(enrollment)
+            # Check for conflict against this student's sections, in memory:
+            # the schedules are already loaded, so no per-candidate queries
+            if not has_schedule_conflict(section, enrolled_sections):
+                enrollment_rows.append({
+                    "student_id": student.id,
+                    "course_section_id": section.id,
+                    "enrollment_date": now,
+                    "status": 'enrolled',
+                })
+                enrolled_sections.append(section)
                 enrolled_count += 1
                 
                 # Update section enrollment count
                 section.enrolled_count += 1
-        
-        print(f"  ✅ Enrolled {student.username}: {enrolled_count} sections")
     
+    # One multi-row INSERT; RETURNING hands back the rows with IDs, no re-select needed
+    enrollments = []
+    if enrollment_rows:
+        result = await session.execute(insert(Enrollment).returning(Enrollment), enrollment_rows)
+        enrollments = result.scalars().all()
     await session.flush()
+    log.info(f"  ✅ Created {len(enrollments)} enrollments for {len(students)} students")
     
-    # Query back all enrollments to ensure we have IDs
-    result = await session.execute(select(Enrollment))
-    enrollments_with_ids = result.scalars().all()
-    
-    return enrollments_with_ids
+    return enrollments
 
 
 async def create_attendance(session: AsyncSession, enrollments: list):
     """Create attendance records. Make 1 student at risk in 2 courses."""
-    print("\n📅 Creating attendance records...")
+    log.info("\n📅 Creating attendance records...")
     
     # Group enrollments by student
     from collections import defaultdict
@@ -563,54 +582,57 @@ async def create_attendance(session: AsyncSession, enrollments: list):
     at_risk_sections = random.sample(student_enrollments[at_risk_student_id], min(2, len(student_enrollments[at_risk_student_id])))
     at_risk_section_ids = [e.course_section_id for e in at_risk_sections]
     
+    # 10 weekly sessions, the same dates for every enrollment
+    now = datetime.now()
+    session_dates = [(now - timedelta(days=70-i*7)).date() for i in range(10)]
+    
+    attendance_rows = []
     for enrollment in enrollments:
         # Create 10 attendance records
-        for i in range(10):
-            date = datetime.now() - timedelta(days=70-i*7)
-            
+        for date in session_dates:
             # If this is an at-risk section, make attendance poor (40% present)
             if enrollment.course_section_id in at_risk_section_ids:
                 is_present = random.random() < 0.4
             else:
                 is_present = random.random() < 0.85  # Normal 85% attendance
             
-            attendance = Attendance(
-                enrollment_id=enrollment.id,
-                date=date.date(),
-                status='present' if is_present else 'absent'
-            )
-            session.add(attendance)
+            attendance_rows.append({
+                "enrollment_id": enrollment.id,
+                "date": date,
+                "status": 'present' if is_present else 'absent',
+            })
     
-    await session.flush()
-    print(f"  ✅ Created attendance records (Student {at_risk_student_id} at risk)")
+    await bulk_insert(session, Attendance, attendance_rows)
+    log.info(f"  ✅ Created attendance records (Student {at_risk_student_id} at risk)")
 
 
 async def create_grades(session: AsyncSession, enrollments: list):
     """Create grades for students."""
-    print("\n📊 Creating grades...")
-    
-    for enrollment in enrollments:
-        # Random grade between 50-95
-        grade_value = random.uniform(50, 95)
-        
-        grade = Grade(
-            enrollment_id=enrollment.id,
-            assignment_name='Final Exam',
-            grade_value=grade_value,
-            max_grade=100.0,
-            weight=1.0,
-            graded_at=datetime.now(),
-            approval_status='published'
-        )
-        session.add(grade)
-    
-    await session.flush()
-    print(f"  ✅ Created {len(enrollments)} grade records")
+    log.info("\n📊 Creating grades...")
+    
+    now = datetime.now()
+    
+    grade_rows = [
+        {
+            "enrollment_id": enrollment.id,
+            "assignment_name": 'Final Exam',
+            "grade_value": random.uniform(50, 95),  # Random grade between 50-95
+            "max_grade": 100.0,
+            "weight": 1.0,
+            "graded_at": now,
+            "approval_status": 'published',
+        }
+        for enrollment in enrollments
+    ]
+    await bulk_insert(session, Grade, grade_rows)
+    log.info(f"  ✅ Created {len(enrollments)} grade records")
 
 
 async def create_fee_structures(session: AsyncSession, students: list, majors: list):
     """Create fee structures for students."""
-    print("\n💰 Creating fee structures...")
+    log.info("\n💰 Creating fee structures...")
+    
+    now = datetime.now()
     
     # Get current semester
     result = await session.execute(
@@ -633,17 +655,19 @@ async def create_fee_structures(session: AsyncSession, students: list, majors: l
             student_id=student.id,
             semester_id=current_semester.id,
             tuition_fee=5000.00,
-            due_date=(datetime.now() + timedelta(days=30)).date()
+            due_date=(now + timedelta(days=30)).date()
         )
         session.add(fee)
     
     await session.flush()
-    print(f"  ✅ Created fee structures for {len(students)} students")
+    log.info(f"  ✅ Created fee structures for {len(students)} students")
 
 
 async def create_invoices(session: AsyncSession, students: list):
     """Create invoices for students."""
-    print("\n🧾 Creating invoices...")
+    log.info("\n🧾 Creating invoices...")
+    
+    now = datetime.now()
     
     # Get current semester
     result = await session.execute(
@@ -656,8 +680,8 @@ async def create_invoices(session: AsyncSession, students: list):
             student_id=student.id,
             semester_id=current_semester.id,
             invoice_number=f"INV-{student.id:04d}-{current_semester.id:02d}",
-            issue_date=datetime.now().date(),
-            due_date=(datetime.now() + timedelta(days=30)).date(),
+            issue_date=now.date(),
+            due_date=(now + timedelta(days=30)).date(),
             total_amount=5000.00,
             status='pending'
         )
@@ -673,36 +697,40 @@ async def create_invoices(session: AsyncSession, students: list):
         session.add(line)
     
     await session.flush()
-    print(f"  ✅ Created invoices for {len(students)} students")
+    log.info(f"  ✅ Created invoices for {len(students)} students")
 
 
 async def create_document_requests(session: AsyncSession, students: list):
     """Create document requests for students."""
-    print("\n📄 Creating document requests...")
+    log.info("\n📄 Creating document requests...")
+    
+    now = datetime.now()
     
     doc_types = ['transcript', 'certificate', 'letter']
     
+    request_rows = []
     for student in students:
         # Create 1-2 document requests per student
         num_requests = random.randint(1, 2)
         for _ in range(num_requests):
-            doc_request = DocumentRequest(
-                student_id=student.id,
-                document_type=random.choice(doc_types),
-                purpose=f"Request for {random.choice(['job application', 'further study', 'personal use'])}",
-                status=random.choice(['pending', 'processing', 'completed']),
-                requested_at=datetime.now(),
-                notes=""
-            )
-            session.add(doc_request)
+            request_rows.append({
+                "student_id": student.id,
+                "document_type": random.choice(doc_types),
+                "purpose": f"Request for {random.choice(['job application', 'further study', 'personal use'])}",
+                "status": random.choice(['pending', 'processing', 'completed']),
+                "requested_at": now,
+                "notes": "",
+            })
     
-    await session.flush()
-    print(f"  ✅ Created document requests")
+    await bulk_insert(session, DocumentRequest, request_rows)
+    log.info(f"  ✅ Created document requests")
 
 
 async def create_fee_structures_and_invoices(session: AsyncSession, students: list):
     """Create fee structures and invoices for students."""
-    print("\n💰 Creating fee structures and invoices...")
+    log.info("\n💰 Creating fee structures and invoices...")
+    
+    now = datetime.now()
     
     # Create fee structures for different programs
     result = await session.execute(select(Major))
@@ -753,8 +781,8 @@ async def create_fee_structures_and_invoices(session: AsyncSession, students: li
         invoice = Invoice(
             student_id=student.id,
             invoice_number=f'INV-2024-{student.id:04d}',
-            issued_date=datetime.now() - timedelta(days=30),
-            due_date=datetime.now() + timedelta(days=30),
+            issued_date=now - timedelta(days=30),
+            due_date=now + timedelta(days=30),
             total_amount=17000000,  # Tuition + Facility
             paid_amount=random.choice([0, 8500000, 17000000]),  # Some paid, some partially paid, some unpaid
             status=random.choice(['pending', 'partial', 'paid'])
@@ -786,12 +814,12 @@ async def create_fee_structures_and_invoices(session: AsyncSession, students: li
         invoice_count += 1
     
     await session.flush()
-    print(f"  ✅ Created {len(fee_structures)} fee structures and {invoice_count} invoices")
+    log.info(f"  ✅ Created {len(fee_structures)} fee structures and {invoice_count} invoices")
 
 
 async def create_announcements(session: AsyncSession):
     """Create 5 announcements."""
-    print("\n📢 Creating announcements...")
+    log.info("\n📢 Creating announcements...")
     
     announcements_data = [
         {"title": "Welcome to New Semester", "content": "Welcome back students! The new semester has begun."},
@@ -801,20 +829,15 @@ async def create_announcements(session: AsyncSession):
         {"title": "Exam Schedule Released", "content": "Final exam schedule is now available on the portal."},
     ]
     
-    for data in announcements_data:
-        announcement = Announcement(
-            **data,
-            is_published=True
-        )
-        session.add(announcement)
-    
-    await session.flush()
-    print(f"  ✅ Created 5 announcements")
+    await bulk_insert(session, Announcement, [{**data, "is_published": True} for data in announcements_data])
+    log.info(f"  ✅ Created 5 announcements")
 
 
 async def create_support_tickets(session: AsyncSession, students: list):
     """Create support tickets for students."""
-    print("\n🎫 Creating support tickets...")
+    log.info("\n🎫 Creating support tickets...")
+    
+    now = datetime.now()
     
     categories = ['technical', 'academic', 'financial', 'account', 'other']
     subjects = [
@@ -825,99 +848,131 @@ async def create_support_tickets(session: AsyncSession, students: list):
         "Question about course schedule"
     ]
     
+    ticket_rows = []
     for student in students:
         # Create 1-2 tickets per student
         num_tickets = random.randint(1, 2)
         for _ in range(num_tickets):
-            ticket = SupportTicket(
-                user_id=student.id,
-                subject=random.choice(subjects),
-                description=f"Support request from {student.username}",
-                category=random.choice(categories),
-                status=random.choice(['open', 'in_progress', 'resolved']),
-                priority=random.choice(['low', 'medium', 'high']),
-                created_at=datetime.now()
-            )
-            session.add(ticket)
+            ticket_rows.append({
+                "user_id": student.id,
+                "subject": random.choice(subjects),
+                "description": f"Support request from {student.username}",
+                "category": random.choice(categories),
+                "status": random.choice(['open', 'in_progress', 'resolved']),
+                "priority": random.choice(['low', 'medium', 'high']),
+                "created_at": now,
+            })
     
-    await session.flush()
-    print(f"  ✅ Created support tickets")
+    await bulk_insert(session, SupportTicket, ticket_rows)
+    log.info(f"  ✅ Created support tickets")
 
 
-async def main():
+async def main(bcrypt_rounds: int = 4, random_seed: int = 42):
     """Main seeding function."""
-    print("\n" + "="*60)
-    print("FRESH DATABASE SEEDING")
-    print("="*60)
+    # Fixed seed: every run produces the same enrollments/attendance/grades, so runs are comparable
+    random.seed(random_seed)
+    
+    log.info("\n" + "="*60)
+    log.info("FRESH DATABASE SEEDING")
+    log.info("="*60)
     
     # Initialize Firebase
     try:
         cred_path = Path(__file__).parent / "credentials" / "serviceAccountKey.json"
         cred = credentials.Certificate(str(cred_path))
         firebase_admin.initialize_app(cred)
-        print("✅ Firebase initialized")
+        log.info("✅ Firebase initialized")
     except Exception as e:
-        print(f"⚠️  Firebase already initialized or error: {e}")
+        log.warning(f"⚠️  Firebase already initialized or error: {e}")
     
-    async with AsyncSessionLocal() as session:
-        # Clear tables
-        await clear_tables(session)
-        
-        # Get existing data
-        campuses = await get_campuses(session)
-        print(f"\n📍 Found {len(campuses)} campuses")
-        
-        # Create new data
-        majors = await create_majors(session)
-        users = await create_users(session, campuses)
-        
-        # Separate users by role
-        students = [u for u in users if u.role == 'student']
-        teachers = [u for u in users if u.role == 'teacher']
-        
-        # Create courses and sections
-        courses = await create_courses(session, majors)
-        sections = await create_sections_and_schedules(session, courses, teachers, campuses)
-        
-        # Enroll students
-        enrollments = await enroll_students(session, students, sections)
-        await session.commit()  # Commit enrollments before creating dependent data
-        
-        # Create related data
-        await create_attendance(session, enrollments)
-        await create_grades(session, enrollments)
-        await create_fee_structures_and_invoices(session, students)
-        await create_document_requests(session, students)
-        await create_announcements(session)
-        await create_support_tickets(session, students)
-        
-        # Commit all changes before session closes
-        await session.commit()
-    
-    print("\n" + "="*60)
-    print("✅ DATABASE SEEDING COMPLETED!")
-    print("="*60)
-    print("\n📝 Summary:")
-    print(f"  - Campuses: {len(campuses)} (kept)")
-    print(f"  - Majors: 3 new (Computing, Business Management, Graphic Design)")
-    print(f"  - Users: {len(users)} total")
-    print(f"    • Students: {len(students)}")
-    print(f"    • Teachers: {len(teachers)}")
-    print(f"    • Admins: {len(users) - len(students) - len(teachers)}")
-    print(f"  - Courses: {len(courses)}")
-    print(f"  - Sections: {len(sections)}")
-    print(f"  - Enrollments: {len(enrollments)}")
-    print(f"  - Announcements: 5")
-    print("\n🔑 Login Credentials:")
-    print(f"  Superadmin: superadmin@greenwich.edu.vn / Admin@123")
-    print(f"\n  📚 Sample Student Logins (by major):")
-    print(f"    Computing (C):   HieuNDGCD220033@student.greenwich.edu.vn / Student@123 (Nguyen Dinh Hieu - Da Nang)")
-    print(f"    Business (B):    AnTMGBH220001@student.greenwich.edu.vn / Student@123 (Tran Minh An - Ha Noi)")
-    print(f"    Design (D):      BaoLHGDH220002@student.greenwich.edu.vn / Student@123 (Le Hoang Bao - Ha Noi)")
-    print(f"\n  👨‍🏫 Sample Teacher Login:")
-    print(f"    teacher_h001@greenwich.edu.vn / Teacher@123")
-    print("="*60 + "\n")
+    async with script_session() as session:
+        # Start hashing now so it overlaps with clearing tables; if an earlier step fails,
+        # the finally below cancels and reaps it instead of leaving it pending
+        hashing = asyncio.create_task(hash_seed_passwords(bcrypt_rounds))
+        try:
+            # Clear tables
+            await clear_tables(session)
+            
+            # Get existing data
+            campuses = await get_campuses(session)
+            log.info(f"\n📍 Found {len(campuses)} campuses")
+            
+            # Create new data
+            majors = await create_majors(session)
+            users = await create_users(session, campuses, await hashing)
+            
+            # Separate users by role in one pass
+            users_by_role = defaultdict(list)
+            for user in users:
+                users_by_role[user.role].append(user)
+            students = users_by_role['student']
+            teachers = users_by_role['teacher']
+            
+            # Create courses and sections
+            courses = await create_courses(session, majors)
+            sections = await create_sections_and_schedules(session, courses, teachers, campuses)
+            
+            # Enroll students
+            enrollments = await enroll_students(session, students, sections)
+            
+            # Create related data
+            await create_attendance(session, enrollments)
+            await create_grades(session, enrollments)
+            await create_fee_structures_and_invoices(session, students)
+            await create_document_requests(session, students)
+            await create_announcements(session)
+            await create_support_tickets(session, students)
+            
+            # Single commit: the whole reseed lands atomically (or not at all)
+            await session.commit()
+        finally:
+            hashing.cancel()
+            await asyncio.gather(hashing, return_exceptions=True)
+    
+    log.info("\n" + "="*60)
+    log.info("✅ DATABASE SEEDING COMPLETED!")
+    log.info("="*60)
+    log.info("\n📝 Summary:")
+    log.info(f"  - Campuses: {len(campuses)} (kept)")
+    log.info(f"  - Majors: 3 new (Computing, Business Management, Graphic Design)")
+    log.info(f"  - Users: {len(users)} total")
+    log.info(f"    • Students: {len(students)}")
+    log.info(f"    • Teachers: {len(teachers)}")
+    log.info(f"    • Admins: {len(users) - len(students) - len(teachers)}")
+    log.info(f"  - Courses: {len(courses)}")
+    log.info(f"  - Sections: {len(sections)}")
+    log.info(f"  - Enrollments: {len(enrollments)}")
+    log.info(f"  - Announcements: 5")
+    log.info("\n🔑 Login Credentials:")
+    log.info(f"  Superadmin: superadmin@greenwich.edu.vn / Admin@123")
+    log.info(f"\n  📚 Sample Student Logins (by major):")
+    log.info(f"    Computing (C):   HieuNDGCD220033@student.greenwich.edu.vn / Student@123 (Nguyen Dinh Hieu - Da Nang)")
+    log.info(f"    Business (B):    AnTMGBH220001@student.greenwich.edu.vn / Student@123 (Tran Minh An - Ha Noi)")
+    log.info(f"    Design (D):      BaoLHGDH220002@student.greenwich.edu.vn / Student@123 (Le Hoang Bao - Ha Noi)")
+    log.info(f"\n  👨‍🏫 Sample Teacher Login:")
+    log.info(f"    teacher_h001@greenwich.edu.vn / Teacher@123")
+    log.info("="*60 + "\n")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Fresh database seeding")
+    parser.add_argument(
+        "--bcrypt-rounds",
+        type=int,
+        default=4,
+        help="bcrypt work factor for seeded passwords (dev data only, default: 4)",
+    )
+    parser.add_argument(
+        "--random-seed",
+        type=int,
+        default=42,
+        help="seed for the random data generator, for reproducible runs (default: 42)",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="only log warnings and errors",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
+    asyncio.run(main(args.bcrypt_rounds, args.random_seed))
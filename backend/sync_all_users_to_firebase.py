@@ -1,10 +1,10 @@
 """Sync all users to Firebase Authentication"""
 
 import asyncio
-from app.core.database import AsyncSessionLocal
+from app.core.database import script_session
 from app.models.user import User
 from app.core.firebase import initialize_firebase
-from sqlalchemy import select
+from sqlalchemy import select, func
 from firebase_admin import auth as firebase_auth
 
 async def sync_users_to_firebase():
@@ -14,19 +14,20 @@ async def sync_users_to_firebase():
     initialize_firebase()
     print("✅ Firebase initialized\n")
     
-    async with AsyncSessionLocal() as session:
-        # Get all users
-        result = await session.execute(select(User))
-        users = result.scalars().all()
+    async with script_session() as session:
+        # Stream users through a server-side cursor, 500 rows at a time,
+        # instead of loading every User into memory up front
+        total = (await session.execute(select(func.count()).select_from(User))).scalar_one()
+        users = await session.stream_scalars(select(User).execution_options(yield_per=500))
         
         default_password = "Test123!@#"
         created_count = 0
         updated_count = 0
         error_count = 0
         
-        print(f"🔄 Syncing {len(users)} users to Firebase Authentication...\n")
+        print(f"🔄 Syncing {total} users to Firebase Authentication...\n")
         
-        for user in users:
+        async for user in users:
             try:
                 if not user.email:
                     print(f"⚠️  {user.username} - No email, skipping")
@@ -55,7 +56,6 @@ async def sync_users_to_firebase():
                     # Update firebase_uid in database if needed
                     if user.firebase_uid != firebase_user.uid:
                         user.firebase_uid = firebase_user.uid
-                        await session.commit()
                     
                     print(f"🔄 Updated: {user.username} ({user.email})")
                     updated_count += 1
@@ -70,7 +70,6 @@ async def sync_users_to_firebase():
                     
                     # Update firebase_uid in database
                     user.firebase_uid = new_firebase_user.uid
-                    await session.commit()
                     
                     print(f"✅ Created: {user.username} ({user.email})")
                     created_count += 1
@@ -79,6 +78,10 @@ async def sync_users_to_firebase():
                 print(f"❌ {user.username} - Error: {str(e)[:80]}")
                 error_count += 1
         
+        # Commit firebase_uid changes once the stream is exhausted;
+        # committing mid-iteration would close the cursor
+        await session.commit()
+        
         print(f"\n{'='*60}")
         print(f"✅ Created: {created_count} users")
         print(f"🔄 Updated: {updated_count} users")
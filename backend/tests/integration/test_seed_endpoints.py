@@ -0,0 +1,69 @@
+"""
+Test Seed Endpoints
+/api/v1/seed/*
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.seed import seed_campuses, seed_majors, seed_users, _code_map
+from app.models.user import User, Campus, Major
+
+
+async def _seed_users(db_session: AsyncSession) -> dict:
+    await seed_campuses(db_session)
+    await seed_majors(db_session)
+    return await seed_users(db_session, await _code_map(db_session, Campus), await _code_map(db_session, Major))
+
+
+@pytest.mark.integration
+@pytest.mark.seed
+class TestSeedUsers:
+    """Test users inserted by the seed phases."""
+    
+    async def test_seed_users_admin_with_students(self, db_session: AsyncSession):
+        """Test admin row (no major/year keys) doesn't drop those columns for students"""
+        result = await _seed_users(db_session)
+        
+        assert result["created"] == result["total"]
+        major_map = await _code_map(db_session, Major)
+        student = (await db_session.execute(
+            select(User).where(User.username == "gch210001")
+        )).scalar_one()
+        assert student.major_id == major_map["C"]
+        assert student.year_entered == 2021
+        admin = (await db_session.execute(
+            select(User).where(User.username == "admin")
+        )).scalar_one()
+        assert admin.major_id is None
+        assert admin.year_entered is None
+    
+    async def test_seed_users_admin_already_exists(self, db_session: AsyncSession):
+        """Test seeding when admin exists inserts only the missing users"""
+        await seed_campuses(db_session)
+        db_session.add(User(
+            username="admin",
+            email="admin@greenwich.edu.vn",
+            full_name="System Administrator",
+            role="admin",
+            status="active",
+            firebase_uid="admin-seed-uid"
+        ))
+        await db_session.flush()
+        
+        result = await _seed_users(db_session)
+        
+        assert result["created"] == result["total"] - 1
+        student = (await db_session.execute(
+            select(User).where(User.username == "gcit240005")
+        )).scalar_one()
+        assert student.year_entered == 2024
+    
+    async def test_seed_users_idempotent(self, db_session: AsyncSession):
+        """Test a second run inserts nothing"""
+        await _seed_users(db_session)
+        
+        result = await seed_users(
+            db_session, await _code_map(db_session, Campus), await _code_map(db_session, Major)
+        )
+        
+        assert result["created"] == 0
@@ -0,0 +1,23 @@
+"""Unit tests for attendance table index declarations."""
+import pytest
+from app.models.academic import Attendance
+
+
+class TestAttendanceIndexes:
+    """Test attendance.date is indexed by BRIN, not a B-tree."""
+    
+    def test_date_brin_index_declared(self):
+        """Test the model declares the BRIN index the alembic revision creates."""
+        indexes = {idx.name: idx for idx in Attendance.__table__.indexes}
+        
+        brin = indexes["brin_attendance_date"]
+        assert [col.name for col in brin.columns] == ["date"]
+        assert brin.dialect_options["postgresql"]["using"] == "brin"
+        assert brin.dialect_options["postgresql"]["with"] == {"pages_per_range": 32}
+    
+    def test_date_has_no_btree_index(self):
+        """Test the superseded ix_attendance_date B-tree is gone."""
+        indexes = {idx.name for idx in Attendance.__table__.indexes}
+        
+        assert "ix_attendance_date" not in indexes
+        assert not Attendance.__table__.c.date.index
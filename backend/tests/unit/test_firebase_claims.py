@@ -0,0 +1,47 @@
+"""Unit tests for Firebase custom claims generation."""
+import pytest
+from types import SimpleNamespace
+from app.models.user import UserRole
+from scripts.update_firebase_claims import build_claims
+
+
+def make_user(**overrides):
+    """Build a user row stand-in with the columns build_claims reads."""
+    fields = {
+        "id": 7,
+        "username": "student1",
+        "role": "student",
+        "campus_id": None,
+        "major_id": None,
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestBuildClaims:
+    """Test custom claims generation."""
+    
+    def test_build_claims_minimal(self):
+        """Test claims without campus or major omit those keys."""
+        claims = build_claims(make_user())
+        
+        assert claims == {"roles": ["student"], "db_user_id": 7, "username": "student1"}
+    
+    def test_build_claims_campus_and_major(self):
+        """Test campus and major are included when set."""
+        claims = build_claims(make_user(campus_id=2, major_id=5))
+        
+        assert claims["campus_id"] == 2
+        assert claims["major_id"] == 5
+    
+    def test_build_claims_enum_role(self):
+        """Test enum roles are stored by value."""
+        claims = build_claims(make_user(role=UserRole.STUDENT))
+        
+        assert claims["roles"] == [UserRole.STUDENT.value]
+    
+    def test_build_claims_admin_mapped(self):
+        """Test legacy admin role maps to super_admin."""
+        claims = build_claims(make_user(role="admin"))
+        
+        assert claims["roles"] == ["super_admin"]
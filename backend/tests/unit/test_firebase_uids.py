@@ -0,0 +1,26 @@
+"""Unit tests for imported Firebase UID generation."""
+import pytest
+from scripts.sync_users_to_firebase import new_firebase_uids
+
+
+class TestNewFirebaseUids:
+    """Test Firebase UID generation."""
+    
+    def test_new_firebase_uids_count_and_format(self):
+        """Test UIDs are 28-char URL-safe strings."""
+        uids = new_firebase_uids(50)
+        
+        assert len(uids) == 50
+        for uid in uids:
+            assert len(uid) == 28
+            assert set(uid) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+    
+    def test_new_firebase_uids_unique(self):
+        """Test UIDs in one batch do not repeat."""
+        uids = new_firebase_uids(1000)
+        
+        assert len(set(uids)) == len(uids)
+    
+    def test_new_firebase_uids_empty(self):
+        """Test zero count returns no UIDs."""
+        assert new_firebase_uids(0) == []
@@ -0,0 +1,18 @@
+"""Unit tests for seeded letter grade lookup."""
+import pytest
+from seed_academic_data import get_letter_grade
+
+
+class TestGetLetterGrade:
+    """Test numeric to letter grade conversion."""
+    
+    @pytest.mark.parametrize("grade_value, letter", [
+        (100, "A"), (90, "A"),
+        (89.9, "B"), (80, "B"),
+        (79.9, "C"), (70, "C"),
+        (69.9, "D"), (60, "D"),
+        (59.9, "F"), (0, "F"),
+    ])
+    def test_get_letter_grade_boundaries(self, grade_value, letter):
+        """Test each threshold is inclusive on its lower bound."""
+        assert get_letter_grade(grade_value) == letter
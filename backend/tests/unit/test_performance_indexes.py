@@ -0,0 +1,63 @@
+"""Unit tests for performance index SQL generation."""
+import pytest
+from migrations.add_performance_indexes import INDEXES, DROPPED_INDEXES, build_sql
+
+
+INDEXES_BY_NAME = {idx.name: idx for idx in INDEXES}
+
+
+class TestBuildSql:
+    """Test CREATE INDEX statement generation."""
+    
+    def test_build_sql_single_column(self):
+        """Test plain B-tree index on one column."""
+        idx = INDEXES_BY_NAME["idx_courses_major"]
+        
+        assert build_sql(idx) == "CREATE INDEX IF NOT EXISTS idx_courses_major ON courses (major_id)"
+    
+    def test_build_sql_multiple_columns(self):
+        """Test composite index keeps column order."""
+        idx = INDEXES_BY_NAME["idx_enrollments_section_status"]
+        
+        assert build_sql(idx) == (
+            "CREATE INDEX IF NOT EXISTS idx_enrollments_section_status "
+            "ON enrollments (course_section_id, status)"
+        )
+    
+    def test_build_sql_brin_attendance_date(self):
+        """Test the BRIN index places access method and storage options around the columns."""
+        idx = INDEXES_BY_NAME["brin_attendance_date"]
+        
+        assert build_sql(idx) == (
+            "CREATE INDEX IF NOT EXISTS brin_attendance_date ON attendance "
+            "USING BRIN (date) WITH (pages_per_range = 32)"
+        )
+    
+    def test_build_sql_attendance_enrollment_date(self):
+        """Test the composite attendance index."""
+        idx = INDEXES_BY_NAME["idx_attendance_enrollment_date"]
+        
+        assert build_sql(idx) == (
+            "CREATE INDEX IF NOT EXISTS idx_attendance_enrollment_date "
+            "ON attendance (enrollment_id, date)"
+        )
+    
+    def test_dropped_index_superseded(self):
+        """Test the dropped B-tree on attendance.date has its BRIN replacement defined."""
+        assert "idx_attendance_date" in DROPPED_INDEXES
+        assert INDEXES_BY_NAME["brin_attendance_date"].columns == ("date",)
+    
+    def test_index_names_unique(self):
+        """Test no two definitions share a name, and none is also dropped."""
+        names = [idx.name for idx in INDEXES]
+        
+        assert len(names) == len(set(names))
+        assert not set(names) & set(DROPPED_INDEXES)
+    
+    @pytest.mark.parametrize("idx", INDEXES, ids=lambda idx: idx.name)
+    def test_build_sql_all_defined_indexes(self, idx):
+        """Test every defined index renders to a CREATE INDEX on its table."""
+        sql = build_sql(idx)
+        
+        assert sql.startswith(f"CREATE INDEX IF NOT EXISTS {idx.name} ON {idx.table}")
+        assert f"({', '.join(idx.columns)})" in sql
@@ -0,0 +1,63 @@
+"""Unit tests for seed enrollment schedule conflict checks."""
+import pytest
+from types import SimpleNamespace
+from seed_fresh_data import has_schedule_conflict
+
+
+def make_section(*sessions):
+    """Build a section stand-in with the given (day, start_time, end_time) sessions."""
+    return SimpleNamespace(schedule={
+        "sessions": [
+            {"day": day, "start_time": start, "end_time": end}
+            for day, start, end in sessions
+        ]
+    })
+
+
+class TestHasScheduleConflict:
+    """Test schedule conflict detection between sections."""
+    
+    def test_no_enrolled_sections(self):
+        """Test no conflict when nothing is enrolled yet."""
+        section = make_section(("Monday", "08:00", "10:00"))
+        
+        assert has_schedule_conflict(section, []) is False
+    
+    def test_overlapping_sessions(self):
+        """Test overlap on the same day is a conflict."""
+        section = make_section(("Monday", "08:00", "10:00"))
+        enrolled = [make_section(("Monday", "09:00", "11:00"))]
+        
+        assert has_schedule_conflict(section, enrolled) is True
+    
+    def test_back_to_back_sessions(self):
+        """Test a session starting when another ends is not a conflict."""
+        section = make_section(("Monday", "10:00", "12:00"))
+        enrolled = [make_section(("Monday", "08:00", "10:00"))]
+        
+        assert has_schedule_conflict(section, enrolled) is False
+    
+    def test_different_days(self):
+        """Test same times on different days are not a conflict."""
+        section = make_section(("Monday", "08:00", "10:00"))
+        enrolled = [make_section(("Tuesday", "08:00", "10:00"))]
+        
+        assert has_schedule_conflict(section, enrolled) is False
+    
+    def test_conflict_in_later_session(self):
+        """Test any pair of sessions can conflict, not just the first."""
+        section = make_section(("Monday", "08:00", "10:00"), ("Wednesday", "13:00", "15:00"))
+        enrolled = [
+            make_section(("Tuesday", "08:00", "10:00")),
+            make_section(("Friday", "08:00", "10:00"), ("Wednesday", "14:00", "16:00")),
+        ]
+        
+        assert has_schedule_conflict(section, enrolled) is True
+    
+    def test_missing_schedules(self):
+        """Test sections without a schedule never conflict."""
+        unscheduled = SimpleNamespace(schedule=None)
+        section = make_section(("Monday", "08:00", "10:00"))
+        
+        assert has_schedule_conflict(unscheduled, [section]) is False
+        assert has_schedule_conflict(section, [unscheduled]) is False